@@ -0,0 +1,40 @@
+"""task change versions and tombstones
+
+Revision ID: 3c1d9e2f4a10
+Revises: 7fb0a58ab444
+Create Date: 2026-10-18 09:12:41.203117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1d9e2f4a10'
+down_revision: Union[str, None] = '7fb0a58ab444'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(sa.schema.CreateSequence(sa.Sequence('task_version_seq')))
+    # Volatile default: existing rows each get their own version on rewrite
+    op.add_column('tasks', sa.Column('version', sa.BigInteger(), server_default=sa.text("nextval('task_version_seq')"), nullable=False))
+    op.create_index(op.f('ix_tasks_version'), 'tasks', ['version'], unique=False)
+    op.create_table('task_tombstones',
+    sa.Column('task_id', sa.UUID(), nullable=False),
+    sa.Column('version', sa.BigInteger(), server_default=sa.text("nextval('task_version_seq')"), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('task_id')
+    )
+    op.create_index(op.f('ix_task_tombstones_version'), 'task_tombstones', ['version'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_task_tombstones_version'), table_name='task_tombstones')
+    op.drop_table('task_tombstones')
+    op.drop_index(op.f('ix_tasks_version'), table_name='tasks')
+    op.drop_column('tasks', 'version')
+    op.execute(sa.schema.DropSequence(sa.Sequence('task_version_seq')))
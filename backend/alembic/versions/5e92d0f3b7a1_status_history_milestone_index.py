@@ -0,0 +1,40 @@
+"""status history milestone index
+
+Revision ID: 5e92d0f3b7a1
+Revises: d41a7c8e0b36
+Create Date: 2026-10-18 18:02:41.207316
+
+Finds the tasks that reached a status within a date range (cycle time
+analytics) without scanning the whole history. Built concurrently, see
+8a4e61b0c5d2.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e92d0f3b7a1'
+down_revision: Union[str, None] = 'd41a7c8e0b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_status_history_to_status_created_at',
+            'status_history',
+            ['to_status', 'created_at', 'task_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_status_history_to_status_created_at',
+            table_name='status_history',
+            postgresql_concurrently=True,
+        )
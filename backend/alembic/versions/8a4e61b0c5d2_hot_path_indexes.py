@@ -0,0 +1,59 @@
+"""hot path indexes
+
+Revision ID: 8a4e61b0c5d2
+Revises: 3c1d9e2f4a10
+Create Date: 2026-10-18 11:40:07.518842
+
+Indexes are built with CREATE INDEX CONCURRENTLY so the migration can run
+against a live database. CONCURRENTLY cannot run inside a transaction,
+hence the autocommit blocks. If a build fails it leaves an INVALID index
+behind: drop it and re-run the migration.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a4e61b0c5d2'
+down_revision: Union[str, None] = '3c1d9e2f4a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ACTIVE_STATUSES = "status IN ('NEW', 'IN_PROGRESS', 'EDITOR_REVIEW', 'CLIENT_APPROVAL')"
+
+# (name, table, columns, partial index predicate)
+INDEXES = [
+    ('ix_tasks_status_status_changed_at', 'tasks', ['status', 'status_changed_at', 'id'], None),
+    ('ix_tasks_active_status_changed_at', 'tasks', ['status_changed_at'], ACTIVE_STATUSES),
+    ('ix_tasks_postponed_resume_date', 'tasks', ['postpone_resume_date'], "status = 'POSTPONED'"),
+    ('ix_tasks_client_id', 'tasks', ['client_id'], None),
+    ('ix_tasks_media_id', 'tasks', ['media_id'], None),
+    ('ix_tasks_author_id', 'tasks', ['author_id'], None),
+    ('ix_tasks_editor_id', 'tasks', ['editor_id'], None),
+    ('ix_tasks_manager_id', 'tasks', ['manager_id'], None),
+    ('ix_messages_task_id_created_at', 'messages', ['task_id', 'created_at'], None),
+    ('ix_files_task_id_uploaded_at', 'files', ['task_id', 'uploaded_at'], None),
+    ('ix_status_history_task_id_created_at', 'status_history', ['task_id', 'created_at'], None),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
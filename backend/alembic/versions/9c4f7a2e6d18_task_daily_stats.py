@@ -0,0 +1,63 @@
+"""task daily stats rollup
+
+Revision ID: 9c4f7a2e6d18
+Revises: 5e92d0f3b7a1
+Create Date: 2026-10-18 19:10:27.551904
+
+The unique key coalesces NULL dimensions to the nil UUID so upserts work
+without NULLS NOT DISTINCT (PostgreSQL 15+). The table is filled from the
+existing status history; backfill_daily_stats.py does the same later.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4f7a2e6d18'
+down_revision: Union[str, None] = '5e92d0f3b7a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+DIMENSIONS = ['author_id', 'editor_id', 'manager_id', 'media_id', 'client_id']
+NIL_UUID = "'00000000-0000-0000-0000-000000000000'::uuid"
+
+
+def upgrade() -> None:
+    op.create_table('task_daily_stats',
+    sa.Column('id', sa.BigInteger(), sa.Identity(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('status', postgresql.ENUM(name='taskstatus', create_type=False), nullable=False),
+    sa.Column('author_id', sa.UUID(), nullable=True),
+    sa.Column('editor_id', sa.UUID(), nullable=True),
+    sa.Column('manager_id', sa.UUID(), nullable=True),
+    sa.Column('media_id', sa.UUID(), nullable=True),
+    sa.Column('client_id', sa.UUID(), nullable=True),
+    sa.Column('entered', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ux_task_daily_stats_key',
+        'task_daily_stats',
+        ['day', 'status', *(sa.text(f'coalesce({name}, {NIL_UUID})') for name in DIMENSIONS)],
+        unique=True,
+    )
+    op.create_index('ix_task_daily_stats_status_day', 'task_daily_stats', ['status', 'day'], unique=False)
+
+    columns = ', '.join(DIMENSIONS)
+    task_columns = ', '.join(f't.{name}' for name in DIMENSIONS)
+    op.execute(f"""
+        INSERT INTO task_daily_stats (day, status, {columns}, entered)
+        SELECT date(timezone('UTC', h.created_at)), h.to_status, {task_columns}, count(*)
+        FROM status_history h JOIN tasks t ON t.id = h.task_id
+        GROUP BY 1, 2, {task_columns}
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_daily_stats_status_day', table_name='task_daily_stats')
+    op.drop_index('ux_task_daily_stats_key', table_name='task_daily_stats')
+    op.drop_table('task_daily_stats')
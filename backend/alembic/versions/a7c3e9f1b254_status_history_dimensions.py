@@ -0,0 +1,44 @@
+"""task dimensions on status history
+
+Revision ID: a7c3e9f1b254
+Revises: f2b8d4a6c913
+Create Date: 2026-10-19 00:21:08.374615
+
+Each history row records the author, editor, manager, media and client the
+task had when it moved, so task_daily_stats counts, undo and rebuilds all
+use the same key. Existing rows get the tasks' current values, the best
+that is known for them; the rollup itself is left alone, since its live
+counters already hold the attribution at the time of each move.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9f1b254'
+down_revision: Union[str, None] = 'f2b8d4a6c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+DIMENSIONS = ['author_id', 'editor_id', 'manager_id', 'media_id', 'client_id']
+
+
+def upgrade() -> None:
+    for column in DIMENSIONS:
+        op.add_column('status_history', sa.Column(column, sa.UUID(), nullable=True))
+
+    assignments = ', '.join(f"{column} = tasks.{column}" for column in DIMENSIONS)
+    op.execute(f"""
+        UPDATE status_history
+        SET {assignments}
+        FROM tasks
+        WHERE tasks.id = status_history.task_id
+    """)
+
+
+def downgrade() -> None:
+    for column in reversed(DIMENSIONS):
+        op.drop_column('status_history', column)
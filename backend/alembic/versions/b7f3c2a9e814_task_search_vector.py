@@ -0,0 +1,90 @@
+"""task full-text search vector
+
+Revision ID: b7f3c2a9e814
+Revises: 8a4e61b0c5d2
+Create Date: 2026-10-18 14:02:55.871204
+
+tasks.search_vector combines title (weight A), client name (B) and
+description (C), using the 'english' configuration for EN tasks and
+'russian' otherwise. It is kept up to date by triggers on tasks and on
+clients (renaming a client refreshes its tasks).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7f3c2a9e814'
+down_revision: Union[str, None] = '8a4e61b0c5d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    op.execute("""
+        CREATE FUNCTION tasks_search_vector_update() RETURNS trigger AS $$
+        DECLARE
+            cfg regconfig := CASE WHEN upper(NEW.language) = 'EN'
+                                  THEN 'english' ELSE 'russian' END;
+            client_name text;
+        BEGIN
+            SELECT concat_ws(' ', first_name, last_name, company)
+              INTO client_name
+              FROM clients
+             WHERE id = NEW.client_id;
+
+            NEW.search_vector :=
+                setweight(to_tsvector(cfg, coalesce(NEW.title, '')), 'A') ||
+                setweight(to_tsvector(cfg, coalesce(client_name, '')), 'B') ||
+                setweight(to_tsvector(cfg, coalesce(NEW.description, '')), 'C');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER tasks_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, description, client_id, language ON tasks
+        FOR EACH ROW EXECUTE FUNCTION tasks_search_vector_update()
+    """)
+
+    op.execute("""
+        CREATE FUNCTION clients_refresh_task_search() RETURNS trigger AS $$
+        BEGIN
+            UPDATE tasks SET title = title WHERE client_id = NEW.id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER clients_refresh_task_search_trigger
+        AFTER UPDATE OF first_name, last_name, company ON clients
+        FOR EACH ROW EXECUTE FUNCTION clients_refresh_task_search()
+    """)
+
+    # Backfill through the trigger
+    op.execute("UPDATE tasks SET title = title")
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_search_vector',
+            'tasks',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_search_vector', table_name='tasks', postgresql_concurrently=True)
+    op.execute("DROP TRIGGER clients_refresh_task_search_trigger ON clients")
+    op.execute("DROP FUNCTION clients_refresh_task_search()")
+    op.execute("DROP TRIGGER tasks_search_vector_trigger ON tasks")
+    op.execute("DROP FUNCTION tasks_search_vector_update()")
+    op.drop_column('tasks', 'search_vector')
@@ -0,0 +1,69 @@
+"""global search vectors for clients, media and users
+
+Revision ID: d41a7c8e0b36
+Revises: b7f3c2a9e814
+Create Date: 2026-10-18 15:26:13.094558
+
+Generated (STORED) tsvector columns, so no triggers are needed; adding them
+rewrites the tables once. GIN indexes are built concurrently.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41a7c8e0b36'
+down_revision: Union[str, None] = 'b7f3c2a9e814'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_DOCUMENTS = {
+    'clients': (
+        "to_tsvector('simple'::regconfig, "
+        "coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || "
+        "coalesce(company, '') || ' ' || coalesce(position, ''))"
+    ),
+    'media': (
+        "setweight(to_tsvector('simple'::regconfig, coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(category, '')), 'B') || "
+        "setweight(to_tsvector('russian'::regconfig, coalesce(description, '')), 'C')"
+    ),
+    'users': (
+        "to_tsvector('simple'::regconfig, "
+        "coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || "
+        "coalesce(email, '') || ' ' || coalesce(telegram_username, ''))"
+    ),
+}
+
+
+def upgrade() -> None:
+    for table, document in SEARCH_DOCUMENTS.items():
+        op.add_column(table, sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(document, persisted=True),
+            nullable=True,
+        ))
+
+    with op.get_context().autocommit_block():
+        for table in SEARCH_DOCUMENTS:
+            op.create_index(
+                f'ix_{table}_search_vector',
+                table,
+                ['search_vector'],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in SEARCH_DOCUMENTS:
+            op.drop_index(f'ix_{table}_search_vector', table_name=table, postgresql_concurrently=True)
+    for table in SEARCH_DOCUMENTS:
+        op.drop_column(table, 'search_vector')
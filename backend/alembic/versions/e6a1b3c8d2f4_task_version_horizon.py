@@ -0,0 +1,67 @@
+"""task versions assigned under a horizon lock
+
+Revision ID: e6a1b3c8d2f4
+Revises: 9c4f7a2e6d18
+Create Date: 2026-10-18 21:04:12.630518
+
+Versions come from task_version_seq when a row is written, but writes
+commit in any order, so a delta sync reader could see version N+1 before
+N commits and skip N for good. Versions are now assigned by a BEFORE
+trigger that first takes a transaction-scoped shared advisory lock keyed by
+the sequence position at that moment (once per transaction). The lock is
+held until commit; /api/tasks/changes only returns versions below every
+held key (see app.services.versions). The column defaults go away: the
+trigger sets the value.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a1b3c8d2f4'
+down_revision: Union[str, None] = '9c4f7a2e6d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ['tasks', 'task_tombstones']
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE FUNCTION task_version_assign() RETURNS trigger AS $$
+        BEGIN
+            IF current_setting('crm.task_version_locked', true) IS DISTINCT FROM 'on' THEN
+                -- Every version this transaction takes is above the key
+                PERFORM pg_advisory_xact_lock_shared((
+                    SELECT CASE WHEN is_called THEN last_value ELSE last_value - 1 END
+                    FROM task_version_seq
+                ));
+                PERFORM set_config('crm.task_version_locked', 'on', true);
+            END IF;
+            NEW.version := nextval('task_version_seq');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER tasks_version_trigger
+        BEFORE INSERT OR UPDATE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION task_version_assign()
+    """)
+    op.execute("""
+        CREATE TRIGGER task_tombstones_version_trigger
+        BEFORE INSERT ON task_tombstones
+        FOR EACH ROW EXECUTE FUNCTION task_version_assign()
+    """)
+    for table in TABLES:
+        op.alter_column(table, 'version', server_default=None)
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN version SET DEFAULT nextval('task_version_seq')")
+    op.execute("DROP TRIGGER task_tombstones_version_trigger ON task_tombstones")
+    op.execute("DROP TRIGGER tasks_version_trigger ON tasks")
+    op.execute("DROP FUNCTION task_version_assign()")
@@ -0,0 +1,44 @@
+"""trigram indexes for task list substring search
+
+Revision ID: f2b8d4a6c913
+Revises: e6a1b3c8d2f4
+Create Date: 2026-10-18 23:12:40.518204
+
+GET /api/tasks/?search= matches substrings of title and description
+(ILIKE '%...%'); pg_trgm GIN indexes keep that from scanning every task
+once the pattern has three or more characters. Built concurrently.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d4a6c913'
+down_revision: Union[str, None] = 'e6a1b3c8d2f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = ['title', 'description']
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for column in COLUMNS:
+            op.create_index(
+                f'ix_tasks_{column}_trgm',
+                'tasks',
+                [column],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for column in COLUMNS:
+            op.drop_index(f'ix_tasks_{column}_trgm', table_name='tasks', postgresql_concurrently=True)
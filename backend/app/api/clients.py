@@ -1,24 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_
 from typing import Optional
 from uuid import UUID
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.models.client import Client
 from app.schemas.client import ClientCreate, ClientUpdate, ClientOut
+from app.services import refcache
+from app.services.etag import conditional, list_etag, row_etag, table_state
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[ClientOut])
 async def get_clients(
+    request: Request,
+    response: Response,
     search: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
+    etag = await list_etag(db, request, table_state(Client))
+    not_modified = conditional(request, response, etag)
+    if not_modified:
+        return not_modified
+    
     query = select(Client)
     
     if search:
@@ -38,9 +47,18 @@ async def get_clients(
 @router.get("/{client_id}", response_model=ClientOut)
 async def get_client(
     client_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
+    etag = await row_etag(db, Client, client_id)
+    if etag is None:
+        raise HTTPException(status_code=404, detail="Client not found")
+    not_modified = conditional(request, response, etag)
+    if not_modified:
+        return not_modified
+    
     result = await db.execute(select(Client).where(Client.id == client_id))
     client = result.scalar_one_or_none()
     if not client:
@@ -78,6 +96,7 @@ async def update_client(
         setattr(client, field, value)
     
     await db.commit()
+    refcache.clients.invalidate(client.id)
     await db.refresh(client)
     return client
 
@@ -95,5 +114,6 @@ async def delete_client(
     
     await db.delete(client)
     await db.commit()
+    refcache.clients.invalidate(client.id)
     return {"ok": True}
 
@@ -5,7 +5,7 @@ from uuid import UUID, uuid4
 from pathlib import Path
 import aiofiles
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.models.file import File
@@ -19,7 +19,7 @@ settings = get_settings()
 @router.get("/task/{task_id}", response_model=list[FileOut])
 async def get_task_files(
     task_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     result = await db.execute(
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.api.auth import get_current_user
+from app.database import pool_stats, replica_engine, replica_monitor
+from app.models.user import User
+from app.services import refcache, hashing, profiler
+from app.services.authcache import auth_cache
+from app.services.analytics_cache import analytics_cache
+
+router = APIRouter()
+
+
+@router.get("/stats")
+async def get_stats(current_user: User = Depends(get_current_user)):
+    """Per-process cache counters (each worker reports its own)"""
+    return {
+        "auth_cache": auth_cache.stats(),
+        "analytics_cache": analytics_cache.stats(),
+        "password_hashing": hashing.stats.as_dict(),
+        "reference_cache": {
+            "users": len(refcache.users),
+            "clients": len(refcache.clients),
+            "media": len(refcache.media),
+        },
+    }
+
+
+@router.get("/stats/db-pool")
+async def get_db_pool_stats(current_user: User = Depends(get_current_user)):
+    """Connection pool usage and checkout waits of this worker"""
+    stats = {"primary": pool_stats()}
+    if replica_engine is not None:
+        stats["replica"] = {**pool_stats(replica_engine), **replica_monitor.as_dict()}
+    return stats
+
+
+@router.get("/profiles")
+async def get_profiles(
+    limit: int = 50,
+    current_user: User = Depends(get_current_user)
+):
+    """SQL profiles of the most recent requests and jobs (sql_profiler only)"""
+    if not profiler.settings.sql_profiler:
+        raise HTTPException(status_code=404, detail="SQL profiler is disabled")
+    profiles = list(profiler.recent_profiles)[-limit:]
+    return [p.as_dict() for p in reversed(profiles)]
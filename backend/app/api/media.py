@@ -1,26 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_
 from typing import Optional
 from uuid import UUID
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.models.media import Media
 from app.schemas.media import MediaCreate, MediaUpdate, MediaOut
+from app.services import refcache
+from app.services.etag import conditional, list_etag, row_etag, table_state
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[MediaOut])
 async def get_media_list(
+    request: Request,
+    response: Response,
     search: Optional[str] = None,
     category: Optional[str] = None,
     language: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
+    etag = await list_etag(db, request, table_state(Media))
+    not_modified = conditional(request, response, etag)
+    if not_modified:
+        return not_modified
+    
     query = select(Media)
     
     if search:
@@ -43,9 +52,18 @@ async def get_media_list(
 @router.get("/{media_id}", response_model=MediaOut)
 async def get_media(
     media_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
+    etag = await row_etag(db, Media, media_id)
+    if etag is None:
+        raise HTTPException(status_code=404, detail="Media not found")
+    not_modified = conditional(request, response, etag)
+    if not_modified:
+        return not_modified
+    
     result = await db.execute(select(Media).where(Media.id == media_id))
     media = result.scalar_one_or_none()
     if not media:
@@ -83,6 +101,7 @@ async def update_media(
         setattr(media, field, value)
     
     await db.commit()
+    refcache.media.invalidate(media.id)
     await db.refresh(media)
     return media
 
@@ -100,5 +119,6 @@ async def delete_media(
     
     await db.delete(media)
     await db.commit()
+    refcache.media.invalidate(media.id)
     return {"ok": True}
 
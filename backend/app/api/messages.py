@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 from uuid import UUID
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.models.message import Message
@@ -16,7 +16,7 @@ router = APIRouter()
 @router.get("/task/{task_id}", response_model=list[MessageOut])
 async def get_task_messages(
     task_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     result = await db.execute(
@@ -74,7 +74,7 @@ async def mark_messages_read(
 @router.get("/task/{task_id}/unread")
 async def get_unread_count(
     task_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get count of unread messages in task"""
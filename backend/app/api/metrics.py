@@ -0,0 +1,105 @@
+from fastapi import APIRouter, Response
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.database import engine, replica_engine, replica_monitor
+from app.middleware import metrics as http_metrics
+from app.services import undo, hashing
+from app.services.authcache import auth_cache
+from app.services.analytics_cache import analytics_cache
+from app.services.metrics import Exposition, CONTENT_TYPE
+from app.ws.board import manager
+
+router = APIRouter()
+
+
+def collect_http(out: Exposition):
+    out.gauge("crm_http_requests_in_flight", "HTTP requests being served", http_metrics.in_flight)
+    for (method, route), histogram in sorted(http_metrics.request_latency.items()):
+        out.histogram(
+            "crm_http_request_duration_seconds",
+            "HTTP request latency by route",
+            histogram,
+            {"method": method, "route": route},
+        )
+    for (method, route, status), count in sorted(http_metrics.request_count.items()):
+        out.counter(
+            "crm_http_requests_total",
+            "HTTP requests by route and status",
+            count,
+            {"method": method, "route": route, "status": status},
+        )
+
+
+def collect_websocket(out: Exposition):
+    out.gauge("crm_websocket_connections", "Open board websocket connections", len(manager.active_connections))
+    out.histogram(
+        "crm_websocket_broadcast_duration_seconds",
+        "Time to fan a board event out to every connection",
+        manager.broadcast_duration,
+    )
+    out.counter(
+        "crm_websocket_send_failures_total",
+        "Broadcast sends that failed and dropped the connection",
+        manager.broadcast_failures,
+    )
+
+
+def collect_db(out: Exposition):
+    pools = [("primary", engine.pool)]
+    if replica_engine is not None:
+        pools.append(("replica", replica_engine.pool))
+    # Samples of one metric must be contiguous, so loop per metric
+    queue_pools = [(name, pool) for name, pool in pools if isinstance(pool, AsyncAdaptedQueuePool)]
+    for name, pool in queue_pools:
+        out.gauge("crm_db_pool_size", "Configured pool size", pool.size(), {"pool": name})
+    for name, pool in queue_pools:
+        out.gauge("crm_db_pool_checked_out", "Connections in use", pool.checkedout(), {"pool": name})
+    for name, pool in queue_pools:
+        out.gauge("crm_db_pool_overflow", "Connections over pool_size (negative: unused capacity)", pool.overflow(), {"pool": name})
+    for name, pool in pools:
+        out.histogram("crm_db_pool_wait_seconds", "Time waiting for a connection", pool.metrics.wait, {"pool": name})
+    for name, pool in pools:
+        for kind in ("read", "write"):
+            out.histogram(
+                "crm_db_pool_hold_seconds",
+                "Time a connection is checked out",
+                getattr(pool.metrics, f"hold_{kind}"),
+                {"pool": name, "session": kind},
+            )
+    for name, pool in pools:
+        out.counter("crm_db_pool_timeouts_total", "Checkouts that timed out", pool.metrics.timeouts, {"pool": name})
+    for name, pool in pools:
+        out.counter("crm_db_pool_connect_errors_total", "Failed connection attempts", pool.metrics.connect_errors, {"pool": name})
+    if replica_monitor is not None:
+        out.gauge("crm_db_replica_lag_seconds", "Measured replica replay lag (NaN: unknown)", replica_monitor.lag)
+
+
+def collect_app(out: Exposition):
+    out.gauge("crm_undo_states", "Pending status-change undo states", undo.pending_count())
+    out.counter("crm_auth_cache_hits_total", "Authenticated user cache hits", auth_cache.hits)
+    out.counter("crm_auth_cache_misses_total", "Authenticated user cache misses", auth_cache.misses)
+    out.gauge("crm_password_hash_in_flight", "bcrypt calls queued or running", hashing.stats.in_flight)
+    lookups = {"hit": analytics_cache.hits, "stale": analytics_cache.stale_hits, "miss": analytics_cache.misses}
+    for result, count in lookups.items():
+        out.counter("crm_analytics_cache_lookups_total", "Analytics cache lookups by result", count, {"result": result})
+    out.counter(
+        "crm_analytics_cache_refresh_failures_total",
+        "Background analytics recomputes that failed",
+        analytics_cache.refresh_failures,
+    )
+    out.histogram(
+        "crm_analytics_compute_seconds",
+        "Time to compute an analytics response on a cache miss or refresh",
+        analytics_cache.compute_time,
+    )
+
+
+@router.get("")
+async def get_metrics():
+    """Prometheus text exposition of this process's metrics"""
+    out = Exposition()
+    collect_http(out)
+    collect_websocket(out)
+    collect_db(out)
+    collect_app(out)
+    return Response(out.text(), media_type=CONTENT_TYPE)
@@ -0,0 +1,76 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, literal, cast, String, union_all
+
+from app.database import get_read_db
+from app.api.auth import get_current_user
+from app.models.user import User
+from app.models.task import Task
+from app.models.client import Client
+from app.models.media import Media
+from app.schemas.search import SearchResults
+from app.services.search import (
+    prefix_query, tsquery, task_tsquery, media_tsquery, matches, SIMPLE,
+)
+
+router = APIRouter()
+
+
+def _full_name(person):
+    return func.concat_ws(" ", person.first_name, person.last_name)
+
+
+@router.get("", response_model=SearchResults)
+async def global_search(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(5, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Search tasks, clients, media and users in one round trip.
+
+    Each entity is a GIN-indexed, ranked LIMIT query over its search_vector;
+    the branches are combined with UNION ALL and grouped by type.
+    """
+    results = {"query": q, "tasks": [], "clients": [], "media": [], "users": []}
+    ts_query_text = prefix_query(q)
+    if ts_query_text is None:
+        return results
+    
+    task_query = task_tsquery(ts_query_text)
+    media_query = media_tsquery(ts_query_text)
+    simple_query = tsquery(ts_query_text, SIMPLE)
+    
+    # (result group, model, tsquery, title, subtitle)
+    sources = [
+        ("tasks", Task, task_query, Task.title, func.lower(cast(Task.status, String))),
+        ("clients", Client, simple_query, _full_name(Client), Client.company),
+        ("media", Media, media_query, Media.name, Media.category),
+        ("users", User, simple_query, _full_name(User), User.email),
+    ]
+    
+    branches = []
+    for group, model, ts_query, title, subtitle in sources:
+        rank = func.ts_rank(model.search_vector, ts_query).label("rank")
+        branches.append(
+            select(
+                literal(group).label("type"),
+                model.id.label("id"),
+                title.label("title"),
+                subtitle.label("subtitle"),
+                rank,
+            )
+            .where(matches(model.search_vector, ts_query))
+            .order_by(rank.desc())
+            .limit(limit)
+        )
+    
+    result = await db.execute(union_all(*branches))
+    for row in result.mappings():
+        results[row["type"]].append(row)
+    
+    for group in ("tasks", "clients", "media", "users"):
+        results[group].sort(key=lambda hit: hit["rank"], reverse=True)
+    
+    return results
@@ -1,21 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, func
-from sqlalchemy.orm import selectinload
-from typing import Optional
+from sqlalchemy import select, insert, update, delete, func, literal, bindparam, case, tuple_, union_all, or_
+from sqlalchemy.orm import aliased
+from typing import Optional, Literal
+from pydantic import TypeAdapter
 from uuid import UUID
 from datetime import datetime
+from uuid import uuid4
+import base64
 
-from app.database import get_db
+from app.config import get_settings
+from app.database import get_db, get_read_db
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.models.task import Task, TaskStatus, TaskType
 from app.models.status_history import StatusHistory
-from app.schemas.task import TaskCreate, TaskUpdate, TaskOut, TaskStatusChange
+from app.models.client import Client
+from app.models.media import Media
+from app.models.task_tombstone import TaskTombstone
+from app.models.task_daily_stats import DIMENSIONS
+from app.schemas.task import (
+    TaskCreate, TaskUpdate, TaskOut, TaskStatusChange, BoardOut, TaskChangesOut,
+    TaskSearchHit, TaskBulkRequest, TaskBulkResult, TaskListNormalized,
+)
+from app.services.search import prefix_query, task_tsquery, task_config, matches, HEADLINE_OPTIONS
 from app.services.undo import save_undo_state, get_undo_state
+from app.services.refcache import build_task_out, build_task_normalized
+from app.services.etag import conditional, list_etag, task_etag, tasks_state
+from app.services.versions import VERSION_HEADER, version_horizon
+from app.services import daily_stats
 from app.ws.board import manager
+from app.responses import FastJSONResponse
 
 router = APIRouter()
+settings = get_settings()
 
 # Pipeline order for determining forward/backward moves
 PIPELINE_ORDER = [
@@ -41,8 +59,389 @@ def is_forward_move(from_status: TaskStatus, to_status: TaskStatus) -> bool:
         return False
 
 
-@router.get("/", response_model=list[TaskOut])
+# Everything TaskOut needs from the tasks row (the search document is never sent)
+TASK_COLUMNS = [column for column in Task.__table__.c if column.key != "search_vector"]
+
+# Checks fast-path payloads against the schema in debug mode
+TASK_LIST = TypeAdapter(list[TaskOut])
+
+# Accept header value selecting TaskListNormalized from the task list
+NORMALIZED_MEDIA_TYPE = "application/vnd.crm.normalized+json"
+
+# Task columns a status change returns as they were before it (for undo)
+PREVIOUS_STATE = ("status", "status_changed_at", "iteration")
+
+# What daily_stats.count_move needs from a written or deleted history row
+HISTORY_STATS_COLUMNS = [
+    StatusHistory.created_at,
+    StatusHistory.to_status,
+    *(getattr(StatusHistory, name) for name in DIMENSIONS),
+]
+
+
+def task_payload(task: Task | dict) -> dict:
+    """JSON-ready TaskOut for websocket events"""
+    return TaskOut.model_validate(task).model_dump(mode="json")
+
+
+async def task_out(db: AsyncSession, row) -> dict:
+    """TaskOut dict for a task row, related objects from the reference cache"""
+    return (await build_task_out(db, [row]))[0]
+
+
+async def transition(
+    db: AsyncSession,
+    task_id: UUID,
+    values: dict,
+    *,
+    user_id: UUID,
+    from_statuses: list[TaskStatus],
+    to_status: TaskStatus,
+    comment: Optional[str],
+) -> tuple[dict, dict] | None:
+    """
+    Apply a status change and record its StatusHistory row and daily stats
+    counter in a single statement (UPDATE ... RETURNING feeding the INSERTs
+    through CTEs).
+
+    The UPDATE only matches while the task is in one of `from_statuses`, so
+    of concurrent transitions from the same status exactly one wins. The
+    task row is locked and read in the same statement, so the status,
+    status_changed_at and iteration it had before come back too. Returns
+    (task row, previous values), or None when nothing matched.
+    """
+    if not from_statuses:
+        return None
+    old = (
+        select(Task.id, Task.status, Task.status_changed_at, Task.iteration)
+        .where(Task.id == task_id)
+        .with_for_update()
+        .subquery("old")
+    )
+    updated = (
+        update(Task)
+        .where(Task.id == old.c.id, Task.status.in_(from_statuses))
+        .values(**values)
+        .returning(
+            *TASK_COLUMNS,
+            *(old.c[name].label(f"previous_{name}") for name in PREVIOUS_STATE),
+        )
+        .cte("updated")
+    )
+    history = (
+        insert(StatusHistory)
+        .from_select(
+            ["id", "task_id", "user_id", "from_status", "to_status", "comment", "iteration", *DIMENSIONS],
+            select(
+                literal(uuid4(), StatusHistory.id.type),
+                updated.c.id,
+                literal(user_id, StatusHistory.user_id.type),
+                updated.c.previous_status,
+                literal(to_status, StatusHistory.to_status.type),
+                literal(comment, StatusHistory.comment.type),
+                updated.c.iteration,
+                *(updated.c[name] for name in DIMENSIONS),
+            ),
+        )
+        .returning(*HISTORY_STATS_COLUMNS)
+        .cte("history")
+    )
+    stats = daily_stats.count_move(history).cte("stats")
+    result = await db.execute(select(updated).add_cte(history, stats))
+    row = result.mappings().one_or_none()
+    if not row:
+        return None
+    task = {column.key: row[column.key] for column in TASK_COLUMNS}
+    previous = {name: row[f"previous_{name}"] for name in PREVIOUS_STATE}
+    return task, previous
+
+
+async def transition_failed(db: AsyncSession, task_id: UUID, detail: str) -> HTTPException:
+    """Tell a missing task (404) from a lost race (409) after a no-op UPDATE"""
+    result = await db.execute(select(Task.id).where(Task.id == task_id))
+    if result.scalar_one_or_none() is None:
+        return HTTPException(status_code=404, detail="Task not found")
+    return HTTPException(status_code=409, detail=detail)
+
+
+# Task columns a board card may additionally request via `fields=`
+BOARD_EXTRA_FIELDS = {
+    "description",
+    "task_type",
+    "language",
+    "google_doc_url",
+    "google_forms_url",
+    "created_at",
+    "iteration",
+    "postpone_reason",
+    "postpone_resume_date",
+    "publication_url",
+    "publication_date",
+    "client_gratitude",
+    "sent_to_whom",
+    "sent_method",
+}
+
+
+def encode_board_cursor(status_changed_at: datetime, task_id: UUID) -> str:
+    """Opaque keyset cursor for the (status_changed_at, id) board ordering"""
+    raw = f"{status_changed_at.isoformat()}|{task_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_board_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        changed_at, task_id = raw.split("|", 1)
+        return datetime.fromisoformat(changed_at), UUID(task_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def display_name(person):
+    """'First Last' for a user/client row, NULL when the relation is empty"""
+    return func.nullif(func.concat_ws(" ", person.first_name, person.last_name), "")
+
+
+def parse_board_fields(fields: Optional[str]) -> list[str]:
+    if not fields:
+        return []
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = set(requested) - BOARD_EXTRA_FIELDS
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return list(dict.fromkeys(requested))
+
+
+@router.get("/board", response_model=BoardOut)
+async def get_board(
+    request: Request,
+    response: Response,
+    status: Optional[TaskStatus] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(30, ge=1, le=200),
+    fields: Optional[str] = None,
+    author_id: Optional[UUID] = None,
+    editor_id: Optional[UUID] = None,
+    manager_id: Optional[UUID] = None,
+    client_id: Optional[UUID] = None,
+    media_id: Optional[UUID] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Board cards paged per status column.
+
+    Without `status` returns the first page of every column; with `status`
+    (and optionally `cursor` from a previous page) returns that column only.
+    """
+    if cursor and not status:
+        raise HTTPException(status_code=400, detail="cursor requires status")
+    
+    etag = await list_etag(db, request, tasks_state())
+    not_modified = conditional(request, response, etag)
+    if not_modified:
+        return not_modified
+    
+    extra_fields = parse_board_fields(fields)
+    after = decode_board_cursor(cursor) if cursor else None
+    
+    Author = aliased(User)
+    Editor = aliased(User)
+    Manager = aliased(User)
+    
+    columns = [
+        Task.id,
+        Task.title,
+        Task.status,
+        Task.status_changed_at,
+        Task.client_id,
+        Task.media_id,
+        Task.author_id,
+        Task.editor_id,
+        Task.manager_id,
+        display_name(Client).label("client_name"),
+        Media.name.label("media_name"),
+        display_name(Author).label("author_name"),
+        display_name(Editor).label("editor_name"),
+        display_name(Manager).label("manager_name"),
+        *(getattr(Task, field) for field in extra_fields),
+    ]
+    
+    filters = []
+    if author_id:
+        filters.append(Task.author_id == author_id)
+    if editor_id:
+        filters.append(Task.editor_id == editor_id)
+    if manager_id:
+        filters.append(Task.manager_id == manager_id)
+    if client_id:
+        filters.append(Task.client_id == client_id)
+    if media_id:
+        filters.append(Task.media_id == media_id)
+    if after:
+        filters.append(tuple_(Task.status_changed_at, Task.id) > after)
+    
+    def column_query(column_status: TaskStatus):
+        # Fetch one extra row to know whether another page exists
+        return (
+            select(*columns)
+            .outerjoin(Client, Client.id == Task.client_id)
+            .outerjoin(Media, Media.id == Task.media_id)
+            .outerjoin(Author, Author.id == Task.author_id)
+            .outerjoin(Editor, Editor.id == Task.editor_id)
+            .outerjoin(Manager, Manager.id == Task.manager_id)
+            .where(Task.status == column_status, *filters)
+            .order_by(Task.status_changed_at.asc(), Task.id.asc())
+            .limit(limit + 1)
+        )
+    
+    statuses = [status] if status else list(TaskStatus)
+    if len(statuses) == 1:
+        query = column_query(statuses[0])
+    else:
+        # One round trip: each column is its own index-friendly LIMIT query
+        query = union_all(*(column_query(s) for s in statuses))
+    
+    result = await db.execute(query)
+    
+    rows_by_status: dict[TaskStatus, list] = {s: [] for s in statuses}
+    for row in result.mappings():
+        rows_by_status[row["status"]].append(dict(row))
+    
+    board = {}
+    for column_status, rows in rows_by_status.items():
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_board_cursor(last["status_changed_at"], last["id"])
+        board[column_status] = {"items": rows, "next_cursor": next_cursor}
+    
+    if settings.debug:
+        BoardOut.model_validate({"columns": board})
+    return FastJSONResponse({"columns": board}, headers=response.headers)
+
+
+@router.get("/changes", response_model=TaskChangesOut)
+async def get_task_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=2000),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Tasks created/updated and tombstones of tasks deleted after version
+    `since`, up to the version horizon: versions still held by running
+    transactions (and anything above them) wait for the next poll, so a
+    client resuming from the returned version never skips a late commit.
+    Reads the primary, since replicas don't see the writers' locks.
+    """
+    horizon = await version_horizon(db)
+    result = await db.execute(
+        select(*TASK_COLUMNS)
+        .where(Task.version > since, Task.version <= horizon)
+        .order_by(Task.version.asc())
+        .limit(limit + 1)
+    )
+    changed = result.mappings().all()
+    
+    tombstones = (await db.execute(
+        select(TaskTombstone.task_id, TaskTombstone.version)
+        .where(TaskTombstone.version > since, TaskTombstone.version <= horizon)
+        .order_by(TaskTombstone.version.asc())
+        .limit(limit + 1)
+    )).all()
+    
+    # Merge both streams by version and cut the page without leaving gaps
+    events = sorted(
+        [(row["version"], row, None) for row in changed]
+        + [(row.version, None, row.task_id) for row in tombstones],
+        key=lambda event: event[0],
+    )
+    has_more = len(events) > limit
+    events = events[:limit]
+    version = events[-1][0] if events else since
+    
+    changes = {
+        "version": version,
+        "tasks": await build_task_out(db, [row for _, row, _ in events if row is not None]),
+        "deleted": [task_id for _, _, task_id in events if task_id is not None],
+        "has_more": has_more,
+    }
+    if settings.debug:
+        TaskChangesOut.model_validate(changes)
+    return FastJSONResponse(changes)
+
+
+@router.get("/search", response_model=list[TaskSearchHit])
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200),
+    status: Optional[TaskStatus] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Ranked full-text search over title, client name and description"""
+    ts_query_text = prefix_query(q)
+    if ts_query_text is None:
+        return []
+    ts_query = task_tsquery(ts_query_text)
+    
+    # Rank and page on the GIN index first; highlight only the returned page
+    rank = func.ts_rank(Task.search_vector, ts_query).label("rank")
+    ranked = (
+        select(
+            Task.id,
+            Task.title,
+            Task.status,
+            Task.client_id,
+            Task.description,
+            Task.language,
+            rank,
+        )
+        .where(matches(Task.search_vector, ts_query))
+    )
+    if status:
+        ranked = ranked.where(Task.status == status)
+    ranked = (
+        ranked
+        .order_by(rank.desc(), Task.id)
+        .limit(limit)
+        .offset(offset)
+        .subquery()
+    )
+    
+    config = task_config(ranked.c.language)
+    query = (
+        select(
+            ranked.c.id,
+            ranked.c.title,
+            ranked.c.status,
+            ranked.c.client_id,
+            ranked.c.rank,
+            func.ts_headline(
+                config, ranked.c.title, ts_query, "HighlightAll=true, " + HEADLINE_OPTIONS
+            ).label("title_highlight"),
+            func.ts_headline(
+                config, ranked.c.description, ts_query, HEADLINE_OPTIONS
+            ).label("snippet"),
+        )
+        .order_by(ranked.c.rank.desc(), ranked.c.id)
+    )
+    
+    result = await db.execute(query)
+    return result.mappings().all()
+
+
+@router.get("/", response_model=list[TaskOut] | TaskListNormalized)
 async def get_tasks(
+    request: Request,
+    response: Response,
     status: Optional[TaskStatus] = None,
     author_id: Optional[UUID] = None,
     editor_id: Optional[UUID] = None,
@@ -50,16 +449,30 @@ async def get_tasks(
     client_id: Optional[UUID] = None,
     media_id: Optional[UUID] = None,
     search: Optional[str] = None,
+    format: Optional[Literal["normalized"]] = None,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    query = select(Task).options(
-        selectinload(Task.client),
-        selectinload(Task.media),
-        selectinload(Task.author),
-        selectinload(Task.editor),
-        selectinload(Task.manager),
-    )
+    """
+    Tasks with their related objects embedded, or with `format=normalized`
+    (or `Accept: application/vnd.crm.normalized+json`) a TaskListNormalized:
+    each user, client and media object once, referenced from tasks by id.
+
+    The X-Task-Version header carries the version horizon read before the
+    list: the list contains every change up to it, so it is where delta
+    sync starts. Reads the primary, like /changes.
+    """
+    normalized = format == "normalized" or NORMALIZED_MEDIA_TYPE in request.headers.get("accept", "")
+    response.headers["Vary"] = "Accept"
+    response.headers[VERSION_HEADER] = str(await version_horizon(db))
+    
+    etag = await list_etag(db, request, tasks_state(), normalized)
+    not_modified = conditional(request, response, etag)
+    if not_modified:
+        return not_modified
+    
+    # Plain rows plus cached related objects, encoded without re-validation
+    query = select(*TASK_COLUMNS)
     
     if status:
         query = query.where(Task.status == status)
@@ -74,6 +487,7 @@ async def get_tasks(
     if media_id:
         query = query.where(Task.media_id == media_id)
     if search:
+        # Substring match (trigram indexes); ranked search is /search
         query = query.where(
             or_(
                 Task.title.ilike(f"%{search}%"),
@@ -85,30 +499,38 @@ async def get_tasks(
     query = query.order_by(Task.status_changed_at.asc())
     
     result = await db.execute(query)
-    return result.scalars().all()
+    rows = result.mappings().all()
+    if normalized:
+        tasks = await build_task_normalized(db, rows)
+        if settings.debug:
+            TaskListNormalized.model_validate(tasks)
+    else:
+        tasks = await build_task_out(db, rows)
+        if settings.debug:
+            TASK_LIST.validate_python(tasks)
+    return FastJSONResponse(tasks, headers=response.headers)
 
 
 @router.get("/{task_id}", response_model=TaskOut)
 async def get_task(
     task_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(
-        select(Task)
-        .options(
-            selectinload(Task.client),
-            selectinload(Task.media),
-            selectinload(Task.author),
-            selectinload(Task.editor),
-            selectinload(Task.manager),
-        )
-        .where(Task.id == task_id)
-    )
-    task = result.scalar_one_or_none()
-    if not task:
+    etag = await task_etag(db, task_id)
+    if etag is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    return task
+    not_modified = conditional(request, response, etag)
+    if not_modified:
+        return not_modified
+    
+    result = await db.execute(select(*TASK_COLUMNS).where(Task.id == task_id))
+    row = result.mappings().one_or_none()
+    if not row:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return await task_out(db, row)
 
 
 @router.post("/", response_model=TaskOut)
@@ -117,28 +539,17 @@ async def create_task(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    task = Task(**task_data.model_dump())
-    db.add(task)
-    await db.commit()
-    
-    # Re-fetch with relationships loaded
     result = await db.execute(
-        select(Task)
-        .options(
-            selectinload(Task.client),
-            selectinload(Task.media),
-            selectinload(Task.author),
-            selectinload(Task.editor),
-            selectinload(Task.manager),
-        )
-        .where(Task.id == task.id)
+        insert(Task).values(**task_data.model_dump()).returning(*TASK_COLUMNS)
     )
-    task = result.scalar_one()
+    task = await task_out(db, result.mappings().one())
+    await db.commit()
     
     # Broadcast to connected clients
     await manager.broadcast({
         "type": "task_created",
-        "task_id": str(task.id),
+        "task_id": str(task["id"]),
+        "task": task_payload(task),
     })
     
     return task
@@ -151,39 +562,49 @@ async def update_task(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(select(Task).where(Task.id == task_id))
-    task = result.scalar_one_or_none()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
     update_data = task_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(task, field, value)
+    if update_data:
+        query = (
+            update(Task)
+            .where(Task.id == task_id)
+            .values(**update_data)
+            .returning(*TASK_COLUMNS)
+        )
+    else:
+        query = select(*TASK_COLUMNS).where(Task.id == task_id)
     
+    row = (await db.execute(query)).mappings().one_or_none()
+    if not row:
+        raise HTTPException(status_code=404, detail="Task not found")
+    task = await task_out(db, row)
     await db.commit()
     
-    # Re-fetch with relationships loaded
-    result = await db.execute(
-        select(Task)
-        .options(
-            selectinload(Task.client),
-            selectinload(Task.media),
-            selectinload(Task.author),
-            selectinload(Task.editor),
-            selectinload(Task.manager),
-        )
-        .where(Task.id == task_id)
-    )
-    task = result.scalar_one()
-    
     await manager.broadcast({
         "type": "task_updated",
-        "task_id": str(task.id),
+        "task_id": str(task["id"]),
+        "task": task_payload(task),
+        "fields": sorted(update_data),
     })
     
     return task
 
 
+def status_change_error(old_status: TaskStatus, status_change: TaskStatusChange) -> HTTPException | None:
+    """Why `status_change` may not be applied to a task in `old_status`, if it may not"""
+    # The client acted on a board that is already out of date
+    if status_change.expected_status and status_change.expected_status != old_status:
+        return HTTPException(status_code=409, detail="Статус задачи уже изменился")
+    
+    if old_status == status_change.status:
+        return HTTPException(status_code=400, detail="Task is already in this status")
+    
+    # Backward/lateral moves need a comment
+    if not is_forward_move(old_status, status_change.status) and not status_change.comment:
+        return HTTPException(status_code=400, detail="Укажите причину перемещения задачи")
+    
+    return None
+
+
 @router.patch("/{task_id}/status", response_model=TaskOut)
 async def change_task_status(
     task_id: UUID,
@@ -191,79 +612,67 @@ async def change_task_status(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(select(Task).where(Task.id == task_id))
-    task = result.scalar_one_or_none()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
-    old_status = task.status
+    """
+    Move a task to another status: one statement plus the commit. The
+    checks run in the UPDATE's WHERE (the statuses the move is valid from);
+    only when it matches nothing is the task read to report why.
+    """
     new_status = status_change.status
+    from_statuses = [s for s in TaskStatus if status_change_error(s, status_change) is None]
     
-    # Validate status transition
-    if old_status == new_status:
-        raise HTTPException(
-            status_code=400,
-            detail="Task is already in this status"
-        )
-    
-    # Save undo state
-    await save_undo_state(str(task_id), {
-        "status": old_status.value,
-        "status_changed_at": task.status_changed_at.isoformat(),
-        "iteration": task.iteration,
-    })
-    
-    # Check if comment required (backward/lateral move)
-    is_forward = is_forward_move(old_status, new_status)
-    if not is_forward and not status_change.comment:
-        raise HTTPException(
-            status_code=400,
-            detail="Укажите причину перемещения задачи"
-        )
+    values = {
+        "status": new_status,
+        "status_changed_at": datetime.utcnow(),
+    }
     
     # Update iteration on backward move
-    if not is_forward and old_status != TaskStatus.POSTPONED:
-        task.iteration += 1
-    
-    # Update task
-    task.status = new_status
-    task.status_changed_at = datetime.utcnow()
+    backward = [
+        s for s in from_statuses
+        if not is_forward_move(s, new_status) and s != TaskStatus.POSTPONED
+    ]
+    if backward:
+        values["iteration"] = case((Task.status.in_(backward), Task.iteration + 1), else_=Task.iteration)
     
     # Handle postponed status
     if new_status == TaskStatus.POSTPONED:
-        task.postpone_reason = status_change.postpone_reason
-        task.postpone_resume_date = status_change.postpone_resume_date
-    
-    # Record history
-    history = StatusHistory(
-        task_id=task.id,
+        values["postpone_reason"] = status_change.postpone_reason
+        values["postpone_resume_date"] = status_change.postpone_resume_date
+    
+    # Update and record history in one statement
+    changed = await transition(
+        db,
+        task_id,
+        values,
         user_id=current_user.id,
-        from_status=old_status,
+        from_statuses=from_statuses,
         to_status=new_status,
         comment=status_change.comment,
-        iteration=task.iteration,
     )
-    db.add(history)
-    
+    if changed is None:
+        result = await db.execute(select(Task.status).where(Task.id == task_id))
+        old_status = result.scalar_one_or_none()
+        if old_status is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+        raise status_change_error(old_status, status_change) or HTTPException(
+            status_code=409, detail="Статус задачи уже изменился"
+        )
+    row, previous = changed
+    task = await task_out(db, row)
     await db.commit()
     
-    # Re-fetch with relationships loaded
-    result = await db.execute(
-        select(Task)
-        .options(
-            selectinload(Task.client),
-            selectinload(Task.media),
-            selectinload(Task.author),
-            selectinload(Task.editor),
-            selectinload(Task.manager),
-        )
-        .where(Task.id == task_id)
-    )
-    task = result.scalar_one()
+    # Save undo state
+    old_status = previous["status"]
+    await save_undo_state(str(task_id), {
+        "status": old_status.value,
+        "status_changed_at": previous["status_changed_at"].isoformat(),
+        "iteration": previous["iteration"],
+        "to_status": new_status.value,
+    })
     
     await manager.broadcast({
         "type": "task_status_changed",
-        "task_id": str(task.id),
+        "task_id": str(task["id"]),
+        "task": task_payload(task),
         "from_status": old_status.value,
         "to_status": new_status.value,
     })
@@ -285,46 +694,44 @@ async def undo_status_change(
             detail="No undo available (expired or already used)"
         )
     
-    result = await db.execute(select(Task).where(Task.id == task_id))
-    task = result.scalar_one_or_none()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
-    # Restore previous state
-    task.status = TaskStatus(previous_state["status"])
-    task.status_changed_at = datetime.fromisoformat(previous_state["status_changed_at"])
-    task.iteration = previous_state["iteration"]
-    
-    # Delete the last history entry
-    last_history = await db.execute(
-        select(StatusHistory)
+    # Restore previous state, delete the last history entry and uncount it
+    last_history = (
+        select(StatusHistory.id)
         .where(StatusHistory.task_id == task_id)
         .order_by(StatusHistory.created_at.desc())
         .limit(1)
+        .scalar_subquery()
     )
-    history_entry = last_history.scalar_one_or_none()
-    if history_entry:
-        await db.delete(history_entry)
-    
-    await db.commit()
-    
-    # Re-fetch with relationships loaded
-    result = await db.execute(
-        select(Task)
-        .options(
-            selectinload(Task.client),
-            selectinload(Task.media),
-            selectinload(Task.author),
-            selectinload(Task.editor),
-            selectinload(Task.manager),
+    restored = (
+        update(Task)
+        .where(Task.id == task_id, Task.status == TaskStatus(previous_state["to_status"]))
+        .values(
+            status=TaskStatus(previous_state["status"]),
+            status_changed_at=datetime.fromisoformat(previous_state["status_changed_at"]),
+            iteration=previous_state["iteration"],
         )
-        .where(Task.id == task_id)
+        .returning(*TASK_COLUMNS)
+        .cte("restored")
     )
-    task = result.scalar_one()
+    history_removed = (
+        delete(StatusHistory)
+        .where(StatusHistory.id == last_history)
+        .returning(*HISTORY_STATS_COLUMNS)
+        .cte("history_removed")
+    )
+    stats = daily_stats.count_move(history_removed, delta=-1).cte("stats")
+    
+    result = await db.execute(select(restored).add_cte(history_removed, stats))
+    row = result.mappings().one_or_none()
+    if not row:
+        raise await transition_failed(db, task_id, "Задачу уже переместили, отмена невозможна")
+    task = await task_out(db, row)
+    await db.commit()
     
     await manager.broadcast({
         "type": "task_undo",
-        "task_id": str(task.id),
+        "task_id": str(task["id"]),
+        "task": task_payload(task),
     })
     
     return task
@@ -337,48 +744,29 @@ async def take_task(
     current_user: User = Depends(get_current_user)
 ):
     """Take task as author and move to in_progress"""
-    result = await db.execute(select(Task).where(Task.id == task_id))
-    task = result.scalar_one_or_none()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
-    if task.status != TaskStatus.NEW:
-        raise HTTPException(status_code=400, detail="Можно взять только новые задачи")
-    
-    task.author_id = current_user.id
-    task.status = TaskStatus.IN_PROGRESS
-    task.status_changed_at = datetime.utcnow()
-    
-    # Record history
-    history = StatusHistory(
-        task_id=task.id,
+    changed = await transition(
+        db,
+        task_id,
+        {
+            "author_id": current_user.id,
+            "status": TaskStatus.IN_PROGRESS,
+            "status_changed_at": datetime.utcnow(),
+        },
         user_id=current_user.id,
-        from_status=TaskStatus.NEW,
+        from_statuses=[TaskStatus.NEW],
         to_status=TaskStatus.IN_PROGRESS,
         comment="Взял в работу",
-        iteration=task.iteration,
     )
-    db.add(history)
-    
+    if changed is None:
+        raise await transition_failed(db, task_id, "Можно взять только новые задачи")
+    row, _ = changed
+    task = await task_out(db, row)
     await db.commit()
     
-    # Re-fetch with relationships loaded
-    result = await db.execute(
-        select(Task)
-        .options(
-            selectinload(Task.client),
-            selectinload(Task.media),
-            selectinload(Task.author),
-            selectinload(Task.editor),
-            selectinload(Task.manager),
-        )
-        .where(Task.id == task_id)
-    )
-    task = result.scalar_one()
-    
     await manager.broadcast({
         "type": "task_taken",
-        "task_id": str(task.id),
+        "task_id": str(task["id"]),
+        "task": task_payload(task),
         "user_id": str(current_user.id),
     })
     
@@ -391,12 +779,17 @@ async def delete_task(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(select(Task).where(Task.id == task_id))
-    task = result.scalar_one_or_none()
-    if not task:
+    # Delete, leave a tombstone and uncount its (cascading) history in one statement
+    deleted = delete(Task).where(Task.id == task_id).returning(Task.id).cte("deleted")
+    stats = daily_stats.uncount_tasks(select(deleted.c.id)).cte("stats")
+    result = await db.execute(
+        insert(TaskTombstone)
+        .from_select(["task_id"], select(deleted.c.id))
+        .returning(TaskTombstone.task_id)
+        .add_cte(stats)
+    )
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    
-    await db.delete(task)
     await db.commit()
     
     await manager.broadcast({
@@ -406,3 +799,144 @@ async def delete_task(
     
     return {"ok": True}
 
+
+@router.post("/bulk", response_model=TaskBulkResult)
+async def bulk_tasks(
+    bulk: TaskBulkRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Apply many status changes, field updates and deletes in one transaction.
+
+    Either every operation succeeds or none does. Writes are batched
+    (executemany updates, one multi-row history insert, one delete) and a
+    single `tasks_bulk` event is broadcast. Bulk status changes are not
+    recorded for undo.
+    """
+    operations = bulk.operations
+    task_ids = [op.task_id for op in operations]
+    if len(set(task_ids)) != len(task_ids):
+        raise HTTPException(status_code=400, detail="Each task may appear only once")
+    
+    result = await db.execute(
+        select(Task.id, Task.status, Task.iteration, *(getattr(Task, name) for name in DIMENSIONS))
+        .where(Task.id.in_(task_ids))
+        .with_for_update()
+    )
+    current = {row.id: row for row in result}
+    missing = [str(task_id) for task_id in task_ids if task_id not in current]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Tasks not found: {', '.join(missing)}")
+    
+    now = datetime.utcnow()
+    status_params: dict[bool, list[dict]] = {True: [], False: []}  # keyed by "to postponed"
+    field_params: dict[tuple, list[dict]] = {}  # keyed by the set of updated fields
+    history_rows = []
+    deleted_ids = []
+    
+    for op in operations:
+        task = current[op.task_id]
+        
+        if op.action == "delete":
+            deleted_ids.append(op.task_id)
+        
+        elif op.action == "update":
+            update_data = op.fields.model_dump(exclude_unset=True) if op.fields else {}
+            if update_data:
+                key = tuple(sorted(update_data))
+                field_params.setdefault(key, []).append(
+                    {"b_id": op.task_id, **{f"b_{k}": v for k, v in update_data.items()}}
+                )
+        
+        else:
+            if op.status is None:
+                raise HTTPException(status_code=400, detail=f"Task {op.task_id}: status is required")
+            if op.status == task.status:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Task {op.task_id}: task is already in this status"
+                )
+            
+            is_forward = is_forward_move(task.status, op.status)
+            if not is_forward and not op.comment:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Task {op.task_id}: укажите причину перемещения задачи"
+                )
+            
+            iteration = task.iteration
+            if not is_forward and task.status != TaskStatus.POSTPONED:
+                iteration += 1
+            
+            to_postponed = op.status == TaskStatus.POSTPONED
+            params = {"b_id": op.task_id, "b_status": op.status, "b_iteration": iteration}
+            if to_postponed:
+                params["b_postpone_reason"] = op.postpone_reason
+                params["b_postpone_resume_date"] = op.postpone_resume_date
+            status_params[to_postponed].append(params)
+            
+            history_rows.append({
+                "id": uuid4(),
+                "task_id": op.task_id,
+                "user_id": current_user.id,
+                "from_status": task.status,
+                "to_status": op.status,
+                "comment": op.comment,
+                "iteration": iteration,
+                **{name: getattr(task, name) for name in DIMENSIONS},
+            })
+    
+    tasks_table = Task.__table__
+    
+    # Status changes: one executemany per shape
+    for to_postponed, params in status_params.items():
+        if not params:
+            continue
+        values = {
+            "status": bindparam("b_status"),
+            "status_changed_at": now,
+            "iteration": bindparam("b_iteration"),
+        }
+        if to_postponed:
+            values["postpone_reason"] = bindparam("b_postpone_reason")
+            values["postpone_resume_date"] = bindparam("b_postpone_resume_date")
+        await db.execute(
+            update(tasks_table).where(tasks_table.c.id == bindparam("b_id")).values(**values),
+            params,
+        )
+    
+    # Field updates: one executemany per set of updated fields
+    for fields, params in field_params.items():
+        await db.execute(
+            update(tasks_table)
+            .where(tasks_table.c.id == bindparam("b_id"))
+            .values(**{field: bindparam(f"b_{field}") for field in fields}),
+            params,
+        )
+    
+    if history_rows:
+        await db.execute(insert(StatusHistory.__table__), history_rows)
+        await daily_stats.count_history(db, [row["id"] for row in history_rows])
+    
+    if deleted_ids:
+        deleted = delete(Task).where(Task.id.in_(deleted_ids)).returning(Task.id).cte("deleted")
+        stats = daily_stats.uncount_tasks(select(deleted.c.id)).cte("stats")
+        await db.execute(
+            insert(TaskTombstone).from_select(["task_id"], select(deleted.c.id)).add_cte(stats)
+        )
+    
+    changed_ids = [task_id for task_id in task_ids if task_id not in deleted_ids]
+    changed = []
+    if changed_ids:
+        result = await db.execute(select(*TASK_COLUMNS).where(Task.id.in_(changed_ids)))
+        changed = await build_task_out(db, result.mappings().all())
+    await db.commit()
+    
+    await manager.broadcast({
+        "type": "tasks_bulk",
+        "tasks": [task_payload(task) for task in changed],
+        "deleted": [str(task_id) for task_id in deleted_ids],
+    })
+    
+    return {"tasks": changed, "deleted": deleted_ids}
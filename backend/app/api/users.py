@@ -1,23 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_
 from typing import Optional
 from uuid import UUID
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.schemas.user import UserUpdate, UserOut
+from app.services import refcache
+from app.services.authcache import auth_cache
+from app.services.etag import conditional, list_etag, row_etag, table_state
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[UserOut])
 async def get_users(
+    request: Request,
+    response: Response,
     search: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
+    etag = await list_etag(db, request, table_state(User))
+    not_modified = conditional(request, response, etag)
+    if not_modified:
+        return not_modified
+    
     query = select(User)
     
     if search:
@@ -37,9 +47,18 @@ async def get_users(
 @router.get("/{user_id}", response_model=UserOut)
 async def get_user(
     user_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
+    etag = await row_etag(db, User, user_id)
+    if etag is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    not_modified = conditional(request, response, etag)
+    if not_modified:
+        return not_modified
+    
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     if not user:
@@ -68,6 +87,8 @@ async def update_user(
         setattr(user, field, value)
     
     await db.commit()
+    refcache.users.invalidate(user.id)
+    auth_cache.invalidate(user.id)
     await db.refresh(user)
     return user
 
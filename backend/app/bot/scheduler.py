@@ -10,6 +10,9 @@ Features:
 
 import asyncio
 import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime, timedelta, date
 from typing import Optional
 
@@ -17,6 +20,9 @@ from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import async_session
+from app.services.profiler import profile
+from app.services.analytics import period_dates, status_counts
+from app.services.metrics import Histogram, Exposition
 from app.models.task import Task, TaskStatus
 from app.models.user import User
 from app.config import get_settings
@@ -38,6 +44,32 @@ class NotificationScheduler:
     def __init__(self):
         self._running = False
         self._tasks: list[asyncio.Task] = []
+        # Per-job run metrics, exposed by run_bot's metrics server
+        self.job_durations: dict[str, Histogram] = {}
+        self.job_failures: Counter[str] = Counter()
+        self.job_last_run: dict[str, float] = {}
+
+    @contextmanager
+    def _job(self, name: str):
+        """Time (and profile) one run of a periodic job"""
+        started = time.perf_counter()
+        try:
+            with profile(f"scheduler.{name}"):
+                yield
+        except Exception:
+            self.job_failures[name] += 1
+            raise
+        finally:
+            self.job_durations.setdefault(name, Histogram()).observe(time.perf_counter() - started)
+            self.job_last_run[name] = time.time()
+
+    def collect_metrics(self, out: Exposition):
+        for name, histogram in sorted(self.job_durations.items()):
+            out.histogram("crm_scheduler_job_duration_seconds", "Run time of periodic jobs", histogram, {"job": name})
+        for name, count in sorted(self.job_failures.items()):
+            out.counter("crm_scheduler_job_failures_total", "Periodic job runs that raised", count, {"job": name})
+        for name, timestamp in sorted(self.job_last_run.items()):
+            out.gauge("crm_scheduler_job_last_run_timestamp_seconds", "When a job last finished", timestamp, {"job": name})
 
     async def start(self):
         """Start all scheduled tasks"""
@@ -66,7 +98,8 @@ class NotificationScheduler:
         """Periodically check for overdue tasks"""
         while self._running:
             try:
-                await self._check_overdue_tasks()
+                with self._job("check_overdue_tasks"):
+                    await self._check_overdue_tasks()
             except Exception as e:
                 logger.error(f"Error checking overdue tasks: {e}")
 
@@ -131,7 +164,8 @@ class NotificationScheduler:
         """Periodically check for follow-up reminders"""
         while self._running:
             try:
-                await self._check_followup_tasks()
+                with self._job("check_followup_tasks"):
+                    await self._check_followup_tasks()
             except Exception as e:
                 logger.error(f"Error checking follow-up tasks: {e}")
 
@@ -178,7 +212,8 @@ class NotificationScheduler:
         """Periodically check for postponed tasks approaching resume date"""
         while self._running:
             try:
-                await self._check_resume_tasks()
+                with self._job("check_resume_tasks"):
+                    await self._check_resume_tasks()
             except Exception as e:
                 logger.error(f"Error checking resume tasks: {e}")
 
@@ -227,7 +262,8 @@ class NotificationScheduler:
         """Send periodic reports based on schedule"""
         while self._running:
             try:
-                await self._send_periodic_reports()
+                with self._job("send_periodic_reports"):
+                    await self._send_periodic_reports()
             except Exception as e:
                 logger.error(f"Error sending periodic reports: {e}")
 
@@ -283,59 +319,9 @@ class NotificationScheduler:
 
     async def _calculate_metrics(self, db: AsyncSession, period: str) -> dict:
         """Calculate metrics for a period"""
-        from sqlalchemy import func
-
-        # Period start date
-        period_days = {
-            "month": 30,
-            "quarter": 90,
-            "half_year": 180,
-            "year": 365,
-        }
-        days = period_days.get(period, 30)
-        start_date = datetime.utcnow() - timedelta(days=days)
-
-        # WIP count
-        wip_statuses = [
-            TaskStatus.NEW, TaskStatus.IN_PROGRESS,
-            TaskStatus.EDITOR_REVIEW, TaskStatus.CLIENT_APPROVAL,
-        ]
-        wip_result = await db.execute(
-            select(func.count(Task.id)).where(Task.status.in_(wip_statuses))
-        )
-        wip = wip_result.scalar() or 0
-
-        # Overdue count
-        three_days_ago = datetime.utcnow() - timedelta(days=3)
-        overdue_result = await db.execute(
-            select(func.count(Task.id)).where(
-                Task.status.in_(wip_statuses),
-                Task.status_changed_at < three_days_ago,
-            )
-        )
-        overdue = overdue_result.scalar() or 0
-
-        # Editor review count
-        editor_result = await db.execute(
-            select(func.count(Task.id)).where(Task.status == TaskStatus.EDITOR_REVIEW)
-        )
-        editor_review = editor_result.scalar() or 0
-
-        # Published count in period
-        published_result = await db.execute(
-            select(func.count(Task.id)).where(
-                Task.status == TaskStatus.PUBLISHED,
-                Task.status_changed_at >= start_date,
-            )
-        )
-        published = published_result.scalar() or 0
-
-        return {
-            "wip": wip,
-            "overdue": overdue,
-            "editor_review": editor_review,
-            "published": published,
-        }
+        start, end, _, _ = period_dates(period)
+        counts = await status_counts(db, start, end)
+        return counts.summary()
 
 
 # Global scheduler instance
@@ -1,15 +1,111 @@
+import asyncio
+import time
+from uuid import uuid4
+
+from fastapi import Request
+from sqlalchemy import event, exc, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from app.config import get_settings
+from app.services.metrics import Histogram
+from app.services import profiler
 
 settings = get_settings()
 
+
+class PoolMetrics:
+    def __init__(self):
+        # Time spent in the pool waiting for (or opening) a connection
+        self.wait = Histogram()
+        self.timeouts = 0
+        self.connect_errors = 0
+        # Checkout to checkin, split by read-only sessions and everything else
+        self.hold_read = Histogram()
+        self.hold_write = Histogram()
+
+
+class InstrumentedPoolMixin:
+    """Times every checkout and how long it is held, counts failures"""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+            record.info["checked_out_at"] = time.perf_counter()
+            record.info["read_only"] = False
+            return record
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        except Exception:
+            self.metrics.connect_errors += 1
+            raise
+        finally:
+            self.metrics.wait.observe(time.perf_counter() - started)
+
+    def _do_return_conn(self, record):
+        started = record.info.pop("checked_out_at", None)
+        if started is not None:
+            held = time.perf_counter() - started
+            if record.info.pop("read_only", False):
+                self.metrics.hold_read.observe(held)
+            else:
+                self.metrics.hold_write.observe(held)
+        super()._do_return_conn(record)
+
+
+def instrumented(pool_class):
+    """
+    Pool class recording into its own PoolMetrics. The metrics live on the
+    class so they survive the pool being recreated after invalidation.
+    """
+    return type(
+        f"Instrumented{pool_class.__name__}",
+        (InstrumentedPoolMixin, pool_class),
+        {"metrics": PoolMetrics()},
+    )
+
+
+def engine_options() -> dict:
+    if settings.db_pgbouncer:
+        # PgBouncer (transaction pooling) does the pooling and may hand each
+        # transaction a different server connection, so prepared statements
+        # must not be cached or reused by name
+        return {
+            "poolclass": instrumented(NullPool),
+            "connect_args": {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            },
+        }
+    return {
+        "poolclass": instrumented(AsyncAdaptedQueuePool),
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "connect_args": {
+            "statement_cache_size": settings.db_statement_cache_size,
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+        },
+    }
+
+
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     future=True,
+    **engine_options(),
 )
 
+if settings.sql_profiler:
+    profiler.install(engine)
+
 async_session = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -17,18 +113,196 @@ async_session = async_sessionmaker(
 )
 
 
+class ReadOnlySyncSession(Session):
+    pass
+
+
+@event.listens_for(ReadOnlySyncSession, "after_begin")
+def _mark_read_only(session, transaction, connection):
+    # Lets the checkin hook attribute the hold time to reads
+    connection.info["read_only"] = True
+
+
+class ReadOnlySession(AsyncSession):
+    """
+    Session for read-only endpoints. Runs in autocommit mode (no BEGIN,
+    COMMIT or ROLLBACK round trips) and hands the connection back to the
+    pool right after each statement: async results are fully buffered, so
+    nothing is held while the response is built and serialized. Loaded
+    objects are detached afterwards, which is fine for reads.
+    """
+
+    async def execute(self, *args, **kwargs):
+        try:
+            return await super().execute(*args, **kwargs)
+        finally:
+            await self.close()
+
+    async def scalar(self, *args, **kwargs):
+        try:
+            return await super().scalar(*args, **kwargs)
+        finally:
+            await self.close()
+
+    async def scalars(self, *args, **kwargs):
+        try:
+            return await super().scalars(*args, **kwargs)
+        finally:
+            await self.close()
+
+    async def get(self, *args, **kwargs):
+        try:
+            return await super().get(*args, **kwargs)
+        finally:
+            await self.close()
+
+
+def read_sessionmaker(engine):
+    return async_sessionmaker(
+        engine.execution_options(isolation_level="AUTOCOMMIT"),
+        class_=ReadOnlySession,
+        sync_session_class=ReadOnlySyncSession,
+        expire_on_commit=False,
+    )
+
+
+read_session = read_sessionmaker(engine)
+
+# Optional streaming replica for read-only endpoints
+replica_engine = None
+replica_session = None
+if settings.replica_database_url:
+    replica_engine = create_async_engine(
+        settings.replica_database_url,
+        echo=settings.debug,
+        future=True,
+        **engine_options(),
+    )
+    replica_session = read_sessionmaker(replica_engine)
+    if settings.sql_profiler:
+        profiler.install(replica_engine)
+
+# Seconds the replica is behind; 0 when it has replayed everything received
+REPLICA_LAG = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp())
+    END
+""")
+
+
+class ReplicaMonitor:
+    """Replica replay lag, measured at most once per `interval` seconds"""
+
+    def __init__(self, engine, max_lag: float, interval: float = 1.0, timeout: float = 1.0):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.interval = interval
+        self.timeout = timeout
+        # None while unknown or unreachable
+        self.lag: float | None = None
+        self.checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    async def usable(self) -> bool:
+        # One request refreshes; concurrent ones go with the last measurement
+        if time.monotonic() - self.checked_at >= self.interval and not self._lock.locked():
+            async with self._lock:
+                await self._refresh()
+        return self.lag is not None and self.lag <= self.max_lag
+
+    async def _measure(self):
+        async with self.engine.connect() as conn:
+            return (await conn.execute(REPLICA_LAG)).scalar()
+
+    async def _refresh(self):
+        try:
+            lag = await asyncio.wait_for(self._measure(), self.timeout)
+            self.lag = float(lag) if lag is not None else None
+        except Exception:
+            self.lag = None
+        self.checked_at = time.monotonic()
+
+    def as_dict(self) -> dict:
+        return {"lag_seconds": self.lag, "max_lag_seconds": self.max_lag}
+
+
+replica_monitor = ReplicaMonitor(replica_engine, settings.replica_max_lag) if replica_engine else None
+
+# Callers that wrote recently read from the primary (read-your-writes).
+# Key: Authorization header, Value: monotonic time until which reads stick.
+_recent_writes: dict[str, float] = {}
+
+
+def mark_write(request: Request):
+    key = request.headers.get("authorization")
+    if not key:
+        return
+    now = time.monotonic()
+    if len(_recent_writes) > 10000:
+        for stale in [k for k, until in _recent_writes.items() if until <= now]:
+            del _recent_writes[stale]
+    _recent_writes[key] = now + settings.read_your_writes_seconds
+
+
+def wrote_recently(request: Request) -> bool:
+    key = request.headers.get("authorization")
+    return key is not None and _recent_writes.get(key, 0) > time.monotonic()
+
+
+def pool_stats(engine=engine) -> dict:
+    pool = engine.pool
+    metrics = pool.metrics
+    stats = {
+        "pgbouncer": settings.db_pgbouncer,
+        "status": pool.status(),
+        "wait_seconds": metrics.wait.as_dict(),
+        "timeouts": metrics.timeouts,
+        "connect_errors": metrics.connect_errors,
+        "hold_seconds": {
+            "read": metrics.hold_read.as_dict(),
+            "write": metrics.hold_write.as_dict(),
+        },
+    }
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            max_overflow=settings.db_max_overflow,
+        )
+    return stats
+
+
 class Base(DeclarativeBase):
     pass
 
 
-async def get_db() -> AsyncSession:
+async def get_db(request: Request) -> AsyncSession:
     async with async_session() as session:
         try:
             yield session
             await session.commit()
+            if request.method not in ("GET", "HEAD", "OPTIONS"):
+                mark_write(request)
         except Exception:
             await session.rollback()
             raise
         finally:
             await session.close()
 
+
+async def get_read_db(request: Request) -> AsyncSession:
+    """
+    Session for read-only endpoints: the replica when one is configured,
+    not lagging more than replica_max_lag and the caller has not written
+    in the last few seconds; the primary otherwise.
+    """
+    maker = read_session
+    if replica_session is not None and not wrote_recently(request) and await replica_monitor.usable():
+        maker = replica_session
+    
+    async with maker() as session:
+        yield session
@@ -0,0 +1,195 @@
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+
+class GzipEncoder:
+    def __init__(self):
+        # wbits=31: gzip container
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class BrotliEncoder:
+    def __init__(self):
+        # Quality 4 is about as fast as gzip -6 and still smaller
+        self._compressor = brotli.Compressor(quality=4)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class ZstdEncoder:
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=3).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+# Server preference order, only what is installed
+ENCODERS = {
+    name: encoder
+    for name, encoder, available in (
+        ("zstd", ZstdEncoder, zstandard is not None),
+        ("br", BrotliEncoder, brotli is not None),
+        ("gzip", GzipEncoder, True),
+    )
+    if available
+}
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Preferred available encoding the client accepts (q > 0)"""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+    for name in ENCODERS:
+        if name in accepted:
+            return name
+    return None
+
+
+def is_compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    return (
+        "content-encoding" not in headers
+        and "content-range" not in headers
+        and (content_type.startswith(COMPRESSIBLE_TYPES) or content_type.endswith(("+json", "+xml")))
+    )
+
+
+class CompressionMiddleware:
+    """
+    Compresses HTTP responses with zstd, Brotli (when the packages are
+    installed) or gzip, whichever the client accepts first in that order.
+
+    Only textual content types are compressed; images, archives and other
+    already-compressed files (e.g. uploads) pass through untouched, as do
+    websockets, HEAD requests and bodies below `minimum_size`. Streaming
+    responses are compressed chunk by chunk with a sync flush after each.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            return await self.app(scope, receive, send)
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        responder = CompressingResponder(send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder)
+
+
+class CompressingResponder:
+    def __init__(self, send, encoding: str, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start_message = None
+        self.encoder = None
+        self.passthrough = False
+
+    def _variant_headers(self) -> MutableHeaders:
+        """Start headers marked as a per-encoding variant"""
+        headers = MutableHeaders(raw=list(self.start_message.get("headers", [])))
+        headers.add_vary_header("Accept-Encoding")
+        # The encoded bytes differ from the identity ones, like nginx weaken the tag
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        return headers
+
+    def _compressed_headers(self, content_length: int | None) -> list:
+        headers = self._variant_headers()
+        headers["Content-Encoding"] = self.encoding
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        return headers.raw
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message.get("headers", []))
+            if message["status"] == 304:
+                # Must carry the same validators and Vary as the 200 it revalidates
+                self.passthrough = True
+                await self.send({**message, "headers": self._variant_headers().raw})
+            elif message["status"] in (204, 206) or not is_compressible(headers):
+                self.passthrough = True
+                await self.send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            if not more_body and len(body) < self.minimum_size:
+                # Small and complete: not worth it
+                self.passthrough = True
+                headers = MutableHeaders(raw=list(self.start_message.get("headers", [])))
+                headers.add_vary_header("Accept-Encoding")
+                await self.send({**self.start_message, "headers": headers.raw})
+                await self.send(message)
+                return
+
+            self.encoder = ENCODERS[self.encoding]()
+            if not more_body:
+                data = self.encoder.finish(body)
+                await self.send({**self.start_message, "headers": self._compressed_headers(len(data))})
+                await self.send({"type": "http.response.body", "body": data})
+                return
+
+            # Streaming: length unknown up front
+            await self.send({**self.start_message, "headers": self._compressed_headers(None)})
+
+        data = self.encoder.compress(body) if more_body else self.encoder.finish(body)
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
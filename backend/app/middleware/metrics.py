@@ -0,0 +1,49 @@
+import time
+from collections import Counter
+
+from app.services.metrics import Histogram
+
+# Key: (method, route template)
+request_latency: dict[tuple[str, str], Histogram] = {}
+# Key: (method, route template, status code)
+request_count: Counter[tuple[str, str, int]] = Counter()
+in_flight = 0
+
+
+class MetricsMiddleware:
+    """
+    Per-route latency and status counts plus in-flight requests. Routes are
+    labelled by their template (/api/tasks/{task_id}); everything else
+    (static files, 404s) shares one label so clients cannot blow up the
+    label set.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        global in_flight
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight -= 1
+            route = scope.get("route")
+            key = (scope["method"], getattr(route, "path_format", None) or "unmatched")
+            histogram = request_latency.get(key)
+            if histogram is None:
+                histogram = request_latency[key] = Histogram()
+            histogram.observe(time.perf_counter() - started)
+            request_count[(*key, status)] += 1
@@ -0,0 +1,28 @@
+from app.services.profiler import profile
+
+
+class ProfilerMiddleware:
+    """
+    Profiles the SQL of every HTTP request and reports it in a
+    Server-Timing header. Pure ASGI so the request runs in the same
+    context the profile is set in.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        with profile(f"{scope['method']} {scope['path']}") as query_profile:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", query_profile.server_timing().encode()))
+                    # Let the (cross-origin) frontend's devtools show it
+                    headers.append((b"timing-allow-origin", b"*"))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
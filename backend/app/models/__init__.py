@@ -5,6 +5,8 @@ from app.models.task import Task, TaskStatus, TaskType
 from app.models.status_history import StatusHistory
 from app.models.message import Message
 from app.models.file import File
+from app.models.task_tombstone import TaskTombstone
+from app.models.task_daily_stats import TaskDailyStats
 
 __all__ = [
     "User",
@@ -16,5 +18,7 @@ __all__ = [
     "StatusHistory",
     "Message",
     "File",
+    "TaskTombstone",
+    "TaskDailyStats",
 ]
 
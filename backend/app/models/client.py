@@ -1,10 +1,18 @@
-from sqlalchemy import Column, String, Text, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, DateTime, Computed, Index
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from uuid import uuid4
 
 from app.database import Base
 
+# Generated search document for global search
+CLIENT_SEARCH_DOCUMENT = (
+    "to_tsvector('simple'::regconfig, "
+    "coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || "
+    "coalesce(company, '') || ' ' || coalesce(position, ''))"
+)
+
 
 class Client(Base):
     __tablename__ = "clients"
@@ -25,6 +33,11 @@ class Client(Base):
     lawyer_name = Column(String(200))
     lawyer_contact = Column(String(200))
     
+    search_vector = deferred(Column(TSVECTOR, Computed(CLIENT_SEARCH_DOCUMENT, persisted=True)))
+    
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-
+    
+    __table_args__ = (
+        Index("ix_clients_search_vector", "search_vector", postgresql_using="gin"),
+    )
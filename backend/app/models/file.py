@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -21,4 +21,7 @@ class File(Base):
     
     # Relationships
     task = relationship("Task", foreign_keys=[task_id])
-
+    
+    __table_args__ = (
+        Index("ix_files_task_id_uploaded_at", "task_id", "uploaded_at"),
+    )
@@ -1,10 +1,18 @@
-from sqlalchemy import Column, String, Text, JSON, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, JSON, DateTime, Computed, Index
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from uuid import uuid4
 
 from app.database import Base
 
+# Generated search document for global search
+MEDIA_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('simple'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(category, '')), 'B') || "
+    "setweight(to_tsvector('russian'::regconfig, coalesce(description, '')), 'C')"
+)
+
 
 class Media(Base):
     __tablename__ = "media"
@@ -22,6 +30,11 @@ class Media(Base):
     contacts = Column(JSON, default=dict)  # {"editor": "...", "email": "..."}
     notes = Column(Text)  # Примечания, требования к материалам
     
+    search_vector = deferred(Column(TSVECTOR, Computed(MEDIA_SEARCH_DOCUMENT, persisted=True)))
+    
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-
+    
+    __table_args__ = (
+        Index("ix_media_search_vector", "search_vector", postgresql_using="gin"),
+    )
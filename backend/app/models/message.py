@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Text, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -23,4 +23,7 @@ class Message(Base):
     # Relationships
     task = relationship("Task", foreign_keys=[task_id])
     user = relationship("User", foreign_keys=[user_id])
-
+    
+    __table_args__ = (
+        Index("ix_messages_task_id_created_at", "task_id", "created_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, Integer, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, DateTime, Integer, ForeignKey, Enum as SQLEnum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -23,7 +23,19 @@ class StatusHistory(Base):
     iteration = Column(Integer, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    # The task's people, media and client at the time of the move: the
+    # task_daily_stats key this row is counted under
+    author_id = Column(UUID(as_uuid=True))
+    editor_id = Column(UUID(as_uuid=True))
+    manager_id = Column(UUID(as_uuid=True))
+    media_id = Column(UUID(as_uuid=True))
+    client_id = Column(UUID(as_uuid=True))
+    
     # Relationships
     task = relationship("Task", foreign_keys=[task_id])
     user = relationship("User", foreign_keys=[user_id])
-
+    
+    __table_args__ = (
+        Index("ix_status_history_task_id_created_at", "task_id", "created_at"),
+        Index("ix_status_history_to_status_created_at", "to_status", "created_at", "task_id"),
+    )
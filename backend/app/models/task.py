@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Text, DateTime, Integer, ForeignKey, Enum as SQLEnum, Date
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, DateTime, Integer, BigInteger, ForeignKey, Enum as SQLEnum, Date, Index, FetchedValue, text
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from uuid import uuid4
 import enum
@@ -25,17 +25,18 @@ class TaskType(str, enum.Enum):
     COVER_LETTER = "cover_letter"  # Сопроводительное письмо
 
 
+
 class Task(Base):
     __tablename__ = "tasks"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     
     # Relations
-    client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False)
-    media_id = Column(UUID(as_uuid=True), ForeignKey("media.id"))
-    author_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
-    editor_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
-    manager_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False, index=True)
+    media_id = Column(UUID(as_uuid=True), ForeignKey("media.id"), index=True)
+    author_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), index=True)
+    editor_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), index=True)
+    manager_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), index=True)
     
     # Basic info
     title = Column(String(255), nullable=False)  # ФИ клиента
@@ -55,6 +56,17 @@ class Task(Base):
     # Iteration counter (increments on backward moves)
     iteration = Column(Integer, default=0)
     
+    # Change version for delta sync, set on every insert/update by the
+    # tasks_version_trigger trigger from task_version_seq (shared with
+    # task_tombstones; see app.services.versions)
+    version = Column(
+        BigInteger,
+        nullable=False,
+        index=True,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+    )
+    
     # Postponed status fields
     postpone_reason = Column(Text)
     postpone_resume_date = Column(Date)
@@ -68,10 +80,43 @@ class Task(Base):
     sent_to_whom = Column(String(255))  # Кому отправлено
     sent_method = Column(String(100))  # Способ отправки
     
+    # Full-text search document (title, client name, description), maintained
+    # by the tasks_search_vector_update() trigger; never loaded by default
+    search_vector = deferred(Column(TSVECTOR))
+    
     # Relationships
     client = relationship("Client", foreign_keys=[client_id])
     media = relationship("Media", foreign_keys=[media_id])
     author = relationship("User", foreign_keys=[author_id])
     editor = relationship("User", foreign_keys=[editor_id])
     manager = relationship("User", foreign_keys=[manager_id])
+    
+    __table_args__ = (
+        # Board columns (keyset order) and per-status analytics ranges
+        Index("ix_tasks_status_status_changed_at", "status", "status_changed_at", "id"),
+        # Overdue scans over the active (WIP) stages
+        Index(
+            "ix_tasks_active_status_changed_at",
+            "status_changed_at",
+            postgresql_where=text(
+                "status IN ('NEW', 'IN_PROGRESS', 'EDITOR_REVIEW', 'CLIENT_APPROVAL')"
+            ),
+        ),
+        # Resume reminders for postponed tasks
+        Index(
+            "ix_tasks_postponed_resume_date",
+            "postpone_resume_date",
+            postgresql_where=text("status = 'POSTPONED'"),
+        ),
+        # Full-text task search
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        # Substring (ILIKE) filter of the task list, pg_trgm
+        Index("ix_tasks_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index(
+            "ix_tasks_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+    )
 
@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Date, Integer, BigInteger, Identity, Enum as SQLEnum, Index, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.database import Base
+from app.models.task import TaskStatus
+
+# Stand-in for NULL dimensions in the unique key (NULLs never conflict)
+NIL_UUID = text("'00000000-0000-0000-0000-000000000000'::uuid")
+
+# People, media and client of the task at the time of the move
+DIMENSIONS = ("author_id", "editor_id", "manager_id", "media_id", "client_id")
+
+
+class TaskDailyStats(Base):
+    """
+    Rollup of status history: how many moves into `status` happened on
+    `day` (UTC) for each combination of task dimensions. Maintained together
+    with status_history writes, rebuilt by backfill_daily_stats.py.
+    """
+    __tablename__ = "task_daily_stats"
+    
+    id = Column(BigInteger, Identity(), primary_key=True)
+    
+    day = Column(Date, nullable=False)
+    status = Column(SQLEnum(TaskStatus), nullable=False)
+    
+    author_id = Column(UUID(as_uuid=True))
+    editor_id = Column(UUID(as_uuid=True))
+    manager_id = Column(UUID(as_uuid=True))
+    media_id = Column(UUID(as_uuid=True))
+    client_id = Column(UUID(as_uuid=True))
+    
+    entered = Column(Integer, nullable=False, default=0)
+
+
+# Upsert target, see app.services.daily_stats
+KEY = [
+    TaskDailyStats.day,
+    TaskDailyStats.status,
+    *(func.coalesce(getattr(TaskDailyStats, name), NIL_UUID) for name in DIMENSIONS),
+]
+
+Index("ux_task_daily_stats_key", *KEY, unique=True)
+Index("ix_task_daily_stats_status_day", TaskDailyStats.status, TaskDailyStats.day)
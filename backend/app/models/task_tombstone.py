@@ -0,0 +1,21 @@
+from sqlalchemy import Column, BigInteger, DateTime, FetchedValue
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class TaskTombstone(Base):
+    """Marker left behind by a deleted task so delta sync can report the removal"""
+    __tablename__ = "task_tombstones"
+    
+    task_id = Column(UUID(as_uuid=True), primary_key=True)
+    
+    # Set by task_tombstones_version_trigger from task_version_seq
+    version = Column(
+        BigInteger,
+        nullable=False,
+        index=True,
+        server_default=FetchedValue(),
+    )
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,10 +1,18 @@
-from sqlalchemy import Column, String, Text, JSON, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, JSON, DateTime, Computed, Index
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from uuid import uuid4
 
 from app.database import Base
 
+# Generated search document for global search
+USER_SEARCH_DOCUMENT = (
+    "to_tsvector('simple'::regconfig, "
+    "coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || "
+    "coalesce(email, '') || ' ' || coalesce(telegram_username, ''))"
+)
+
 
 class User(Base):
     __tablename__ = "users"
@@ -24,6 +32,11 @@ class User(Base):
     bio = Column(Text)
     languages = Column(JSON, default=["RU"])  # ["RU", "EN"]
     
+    search_vector = deferred(Column(TSVECTOR, Computed(USER_SEARCH_DOCUMENT, persisted=True)))
+    
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-
+    
+    __table_args__ = (
+        Index("ix_users_search_vector", "search_vector", postgresql_using="gin"),
+    )
@@ -0,0 +1,16 @@
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response for large payloads built from trusted database rows.
+
+    Returning it from a route skips FastAPI's response_model validation and
+    the stdlib json encoder: pydantic-core's Rust encoder writes plain dicts,
+    lists, UUIDs, datetimes and enums straight to bytes, in the same format
+    the response models would produce.
+    """
+
+    def render(self, content) -> bytes:
+        return to_json(content)
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import Optional
+from uuid import UUID
+
+
+class SearchHit(BaseModel):
+    id: UUID
+    title: str
+    subtitle: Optional[str] = None
+    rank: float
+
+
+class SearchResults(BaseModel):
+    query: str
+    tasks: list[SearchHit] = []
+    clients: list[SearchHit] = []
+    media: list[SearchHit] = []
+    users: list[SearchHit] = []
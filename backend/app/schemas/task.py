@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Optional, Literal
 from uuid import UUID
 from datetime import datetime, date
 
@@ -54,12 +54,33 @@ class TaskUpdate(BaseModel):
 
 class TaskStatusChange(BaseModel):
     status: TaskStatus
+    # Status the client saw; a mismatch is rejected with 409
+    expected_status: Optional[TaskStatus] = None
     comment: Optional[str] = None
     postpone_reason: Optional[str] = None
     postpone_resume_date: Optional[date] = None
 
 
-class TaskOut(BaseModel):
+class TaskBulkOperation(BaseModel):
+    task_id: UUID
+    action: Literal["status", "update", "delete"]
+    
+    # action == "status"
+    status: Optional[TaskStatus] = None
+    comment: Optional[str] = None
+    postpone_reason: Optional[str] = None
+    postpone_resume_date: Optional[date] = None
+    
+    # action == "update"
+    fields: Optional[TaskUpdate] = None
+
+
+class TaskBulkRequest(BaseModel):
+    operations: list[TaskBulkOperation] = Field(..., min_length=1, max_length=1000)
+
+
+class TaskRowOut(BaseModel):
+    """Task fields without the nested related objects"""
     id: UUID
     client_id: UUID
     media_id: Optional[UUID] = None
@@ -79,6 +100,7 @@ class TaskOut(BaseModel):
     created_at: datetime
     status_changed_at: datetime
     iteration: int
+    version: int
     
     postpone_reason: Optional[str] = None
     postpone_resume_date: Optional[date] = None
@@ -90,6 +112,11 @@ class TaskOut(BaseModel):
     sent_to_whom: Optional[str] = None
     sent_method: Optional[str] = None
     
+    class Config:
+        from_attributes = True
+
+
+class TaskOut(TaskRowOut):
     # Nested objects
     client: Optional[ClientOut] = None
     media: Optional[MediaOut] = None
@@ -100,3 +127,66 @@ class TaskOut(BaseModel):
     class Config:
         from_attributes = True
 
+
+class TaskListNormalized(BaseModel):
+    """Task list with each related object sent once, referenced by id"""
+    tasks: list[TaskRowOut]
+    users: dict[UUID, UserOut]
+    clients: dict[UUID, ClientOut]
+    media: dict[UUID, MediaOut]
+
+
+class TaskChangesOut(BaseModel):
+    version: int  # pass back as `since` on the next call
+    tasks: list[TaskOut]  # created or updated
+    deleted: list[UUID]
+    has_more: bool = False
+
+
+class TaskBulkResult(BaseModel):
+    tasks: list[TaskOut]  # changed by status/update operations
+    deleted: list[UUID]
+
+
+class TaskSearchHit(BaseModel):
+    id: UUID
+    title: str
+    status: TaskStatus
+    client_id: UUID
+    rank: float
+    # Fragments with matches wrapped in <mark>...</mark>
+    title_highlight: str
+    snippet: Optional[str] = None
+
+
+class TaskCard(BaseModel):
+    """Slim board card; extra columns requested via `fields=` are passed through"""
+    id: UUID
+    title: str
+    status: TaskStatus
+    status_changed_at: datetime
+    
+    client_id: UUID
+    media_id: Optional[UUID] = None
+    author_id: Optional[UUID] = None
+    editor_id: Optional[UUID] = None
+    manager_id: Optional[UUID] = None
+    
+    # Display names
+    client_name: Optional[str] = None
+    media_name: Optional[str] = None
+    author_name: Optional[str] = None
+    editor_name: Optional[str] = None
+    manager_name: Optional[str] = None
+    
+    class Config:
+        extra = "allow"
+
+
+class BoardColumn(BaseModel):
+    items: list[TaskCard]
+    next_cursor: Optional[str] = None
+
+
+class BoardOut(BaseModel):
+    columns: dict[TaskStatus, BoardColumn]
@@ -0,0 +1,330 @@
+"""
+Shared analytics queries.
+
+Dashboard numbers (stage occupancy, on-time share, WIP, overdue, editor
+review, published in period) all come from one `GROUP BY status` pass over
+tasks with `COUNT(*) FILTER (...)` columns, instead of one COUNT per number.
+Used by the analytics API and the scheduler's periodic reports.
+
+Cycle times come from status_history: per task the first time each
+milestone was reached, measured from task creation (tasks start in NEW and
+history rows are only written on moves). Stage durations pair every move
+with the previous one of the same task.
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import select, func, and_, cast, literal, union_all, Float
+from sqlalchemy.dialects.postgresql import ARRAY, array
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task, TaskStatus
+from app.models.status_history import StatusHistory
+
+PERIODS = {
+    "month": timedelta(days=30),
+    "quarter": timedelta(days=90),
+    "half_year": timedelta(days=180),
+    "year": timedelta(days=365),
+}
+
+WIP_STATUSES = (
+    TaskStatus.NEW,
+    TaskStatus.IN_PROGRESS,
+    TaskStatus.EDITOR_REVIEW,
+    TaskStatus.CLIENT_APPROVAL,
+)
+
+# Editor approval: leaving review forwards (lateral moves may skip stages)
+AFTER_EDITOR_REVIEW = (
+    TaskStatus.CLIENT_APPROVAL,
+    TaskStatus.CLIENT_APPROVED,
+    TaskStatus.SENT_TO_MEDIA,
+    TaskStatus.PUBLISHED,
+)
+
+# Per-task milestone columns: first history row matching the condition
+MILESTONES = {
+    "started_at": StatusHistory.to_status == TaskStatus.IN_PROGRESS,
+    "editor_approved_at": and_(
+        StatusHistory.from_status == TaskStatus.EDITOR_REVIEW,
+        StatusHistory.to_status.in_(AFTER_EDITOR_REVIEW),
+    ),
+    "client_approved_at": StatusHistory.to_status == TaskStatus.CLIENT_APPROVED,
+    "published_at": StatusHistory.to_status == TaskStatus.PUBLISHED,
+}
+
+# Metric name -> (clock start, clock stop) milestone columns
+CYCLE_METRICS = {
+    "new_to_client_approved": ("created_at", "client_approved_at"),
+    "new_to_editor_approved": ("created_at", "editor_approved_at"),
+    "new_to_published": ("created_at", "published_at"),
+    "in_progress_to_published": ("started_at", "published_at"),
+}
+
+CYCLE_PERCENTILES = (0.5, 0.85, 0.95)
+
+# Upper bounds (hours) of the stage-duration histogram buckets, plus +Inf
+STAGE_BUCKETS = (1, 4, 8, 24, 48, 72, 120, 168, 336, 720)
+STAGE_PERCENTILES = (0.5, 0.9, 0.99)
+
+# A task sitting longer than this in its current stage is overdue
+OVERDUE_AFTER = timedelta(days=3)
+
+
+def period_dates(period: str, compare_period: Optional[str] = None):
+    """Start/end of `period` ending now, and of `compare_period` right before it"""
+    now = datetime.utcnow()
+    delta = PERIODS.get(period, PERIODS["month"])
+    start = now - delta
+
+    compare_start = None
+    compare_end = None
+    if compare_period:
+        compare_start = start - PERIODS.get(compare_period, delta)
+        compare_end = start
+
+    return start, now, compare_start, compare_end
+
+
+def task_filters(
+    author_id=None,
+    editor_id=None,
+    manager_id=None,
+    client_id=None,
+    media_id=None,
+) -> list:
+    filters = []
+    for column, value in (
+        (Task.author_id, author_id),
+        (Task.editor_id, editor_id),
+        (Task.manager_id, manager_id),
+        (Task.client_id, client_id),
+        (Task.media_id, media_id),
+    ):
+        if value:
+            filters.append(column == value)
+    return filters
+
+
+class StatusCounts:
+    """Per-status counters from a single aggregate row set"""
+
+    def __init__(self, rows):
+        self.total = {status: 0 for status in TaskStatus}
+        self.on_time = {status: 0 for status in TaskStatus}
+        self.overdue_by_status = {status: 0 for status in TaskStatus}
+        self.changed_in_period = {status: 0 for status in TaskStatus}
+        for row in rows:
+            self.total[row.status] = row.total
+            self.on_time[row.status] = row.on_time
+            self.overdue_by_status[row.status] = row.overdue
+            self.changed_in_period[row.status] = row.changed_in_period
+
+    @property
+    def wip(self) -> int:
+        return sum(self.total[status] for status in WIP_STATUSES)
+
+    @property
+    def overdue(self) -> int:
+        return sum(self.overdue_by_status[status] for status in WIP_STATUSES)
+
+    @property
+    def editor_review(self) -> int:
+        return self.total[TaskStatus.EDITOR_REVIEW]
+
+    @property
+    def published(self) -> int:
+        """Published within the period"""
+        return self.changed_in_period[TaskStatus.PUBLISHED]
+
+    def stages(self) -> dict:
+        return {status.value: self.total[status] for status in TaskStatus}
+
+    def stages_no_delay_percent(self) -> dict:
+        return {
+            status.value: (self.on_time[status] / self.total[status] * 100) if self.total[status] else 100
+            for status in TaskStatus
+        }
+
+    def summary(self) -> dict:
+        return {
+            "wip": self.wip,
+            "overdue": self.overdue,
+            "editor_review": self.editor_review,
+            "published": self.published,
+        }
+
+
+async def status_counts(
+    db: AsyncSession,
+    start: datetime,
+    end: datetime,
+    filters: list = (),
+) -> StatusCounts:
+    """
+    All per-status counters in one query. `start`/`end` bound the
+    "changed in period" column (e.g. published in period).
+    """
+    overdue_since = datetime.utcnow() - OVERDUE_AFTER
+    query = (
+        select(
+            Task.status,
+            func.count().label("total"),
+            func.count().filter(Task.status_changed_at >= overdue_since).label("on_time"),
+            func.count().filter(Task.status_changed_at < overdue_since).label("overdue"),
+            func.count().filter(
+                Task.status_changed_at >= start,
+                Task.status_changed_at <= end,
+            ).label("changed_in_period"),
+        )
+        .where(*filters)
+        .group_by(Task.status)
+    )
+    result = await db.execute(query)
+    return StatusCounts(result.all())
+
+
+def _cycle_samples(start: datetime, end: datetime):
+    """One (metric, finished_at, days) row per task and metric finished in [start, end]"""
+    # Only tasks that reached a clock-stop status in the window, found via
+    # ix_status_history_to_status_created_at; their full history is then
+    # read through ix_status_history_task_id_created_at
+    finished = select(StatusHistory.task_id).where(
+        StatusHistory.to_status.in_(AFTER_EDITOR_REVIEW),
+        StatusHistory.created_at >= start,
+        StatusHistory.created_at <= end,
+    )
+    milestones = (
+        select(
+            StatusHistory.task_id,
+            Task.created_at,
+            *(
+                func.min(StatusHistory.created_at).filter(condition).label(name)
+                for name, condition in MILESTONES.items()
+            ),
+        )
+        .join(Task, Task.id == StatusHistory.task_id)
+        .where(StatusHistory.task_id.in_(finished))
+        .group_by(StatusHistory.task_id, Task.created_at)
+        .cte("milestones")
+    )
+    samples = []
+    for name, (clock_start, clock_stop) in CYCLE_METRICS.items():
+        begun, finished_at = milestones.c[clock_start], milestones.c[clock_stop]
+        samples.append(
+            select(
+                literal(name).label("metric"),
+                finished_at.label("finished_at"),
+                cast(func.extract("epoch", finished_at - begun) / 86400, Float).label("days"),
+            ).where(
+                finished_at >= start,
+                finished_at <= end,
+                finished_at >= begun,
+            )
+        )
+    return union_all(*samples).subquery("samples")
+
+
+def _percentile_values(values, percentiles) -> dict:
+    return {f"p{round(q * 100)}": values[n] if values else None for n, q in enumerate(percentiles)}
+
+
+async def cycle_times(db: AsyncSession, ranges: list[tuple[datetime, datetime]]) -> list[dict]:
+    """
+    Count, mean and percentiles (days) of every CYCLE_METRICS entry for
+    each (start, end) range, computed in one query. A task counts towards
+    the range in which it first reached the clock-stop milestone.
+    """
+    samples = _cycle_samples(min(start for start, _ in ranges), max(end for _, end in ranges))
+    percentiles = cast(array(CYCLE_PERCENTILES), ARRAY(Float))
+
+    columns = [samples.c.metric]
+    for i, (start, end) in enumerate(ranges):
+        in_range = and_(samples.c.finished_at >= start, samples.c.finished_at <= end)
+        columns += [
+            func.count().filter(in_range).label(f"count_{i}"),
+            func.avg(samples.c.days).filter(in_range).label(f"mean_{i}"),
+            func.percentile_cont(percentiles).within_group(samples.c.days).filter(in_range).label(f"pct_{i}"),
+        ]
+    result = await db.execute(select(*columns).group_by(samples.c.metric))
+    rows = {row.metric: row._mapping for row in result}
+
+    report = []
+    for i in range(len(ranges)):
+        metrics = {}
+        for name in CYCLE_METRICS:
+            row = rows.get(name)
+            values = row[f"pct_{i}"] if row is not None else None
+            metrics[name] = {
+                "count": row[f"count_{i}"] if row is not None else 0,
+                "mean": float(row[f"mean_{i}"]) if row is not None and row[f"mean_{i}"] is not None else None,
+                **_percentile_values(values, CYCLE_PERCENTILES),
+            }
+        report.append(metrics)
+    return report
+
+
+async def stage_durations(db: AsyncSession, start: datetime, end: datetime, filters: list = ()) -> dict:
+    """
+    Per stage: count, mean, percentiles and a STAGE_BUCKETS histogram of
+    the hours tasks spent in it, for stays that ended in [start, end].
+    A stay runs from the previous move of the task (or its creation) to the
+    move out of the stage. One query.
+    """
+    touched = select(StatusHistory.task_id).where(
+        StatusHistory.created_at >= start,
+        StatusHistory.created_at <= end,
+    )
+    previous_move = func.lag(StatusHistory.created_at).over(
+        partition_by=StatusHistory.task_id,
+        order_by=StatusHistory.created_at,
+    )
+    entered_at = func.coalesce(previous_move, Task.created_at)
+    stays = (
+        select(
+            StatusHistory.from_status.label("stage"),
+            StatusHistory.created_at.label("left_at"),
+            cast(func.extract("epoch", StatusHistory.created_at - entered_at) / 3600, Float).label("hours"),
+        )
+        .join(Task, Task.id == StatusHistory.task_id)
+        .where(StatusHistory.task_id.in_(touched), *filters)
+        .subquery("stays")
+    )
+    hours = stays.c.hours
+
+    buckets = []
+    lower = None
+    for upper in (*STAGE_BUCKETS, None):
+        in_bucket = []
+        if lower is not None:
+            in_bucket.append(hours > lower)
+        if upper is not None:
+            in_bucket.append(hours <= upper)
+        buckets.append(func.count().filter(and_(*in_bucket)))
+        lower = upper
+
+    query = (
+        select(
+            stays.c.stage,
+            func.count().label("count"),
+            func.avg(hours).label("mean"),
+            func.percentile_cont(cast(array(STAGE_PERCENTILES), ARRAY(Float))).within_group(hours).label("percentiles"),
+            *(bucket.label(f"bucket_{i}") for i, bucket in enumerate(buckets)),
+        )
+        .where(stays.c.left_at >= start, stays.c.left_at <= end)
+        .group_by(stays.c.stage)
+    )
+    result = await db.execute(query)
+
+    stages = {}
+    for row in result.mappings():
+        stages[row["stage"].value] = {
+            "count": row["count"],
+            "mean_hours": row["mean"],
+            **{f"{name}_hours": value for name, value in _percentile_values(row["percentiles"], STAGE_PERCENTILES).items()},
+            # Counts per STAGE_BUCKETS bucket, the last one above the largest bound
+            "histogram": [row[f"bucket_{i}"] for i in range(len(buckets))],
+        }
+    return stages
@@ -0,0 +1,136 @@
+"""
+Cache of /api/analytics responses.
+
+Entries are keyed by endpoint and query parameters and tagged with the task
+data version: the maxima of tasks.version and task_tombstones.version, which
+every task create/update/move/delete advances (task_version_seq). Reading
+it is two index lookups, and it is shared by all workers, so a write in
+any process invalidates every cache on the next request.
+
+A stale entry (older version, or older than `ttl` since periods and the
+overdue threshold move with the clock) is still served while a single
+background task recomputes it, unless it is older than `max_stale`.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from fastapi import Request
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import read_session
+from app.models.task import Task
+from app.models.task_tombstone import TaskTombstone
+from app.services.metrics import Histogram
+from app.services.profiler import profile
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+Compute = Callable[[AsyncSession], Awaitable[Any]]
+
+
+async def data_version(db: AsyncSession) -> tuple:
+    result = await db.execute(
+        select(
+            select(func.max(Task.version)).scalar_subquery(),
+            select(func.max(TaskTombstone.version)).scalar_subquery(),
+        )
+    )
+    return tuple(result.one())
+
+
+def cache_key(request: Request) -> tuple:
+    return request.url.path, tuple(sorted(request.query_params.multi_items()))
+
+
+class AnalyticsCache:
+    """Bounded LRU of computed responses with stale-while-revalidate"""
+
+    def __init__(self, max_size: int = 256, ttl: float = 300, max_stale: float = 3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_stale = max_stale
+        # Key: (path, params), Value: (data version, computed_at, response)
+        self._entries: OrderedDict[tuple, tuple[tuple, float, Any]] = OrderedDict()
+        # Keys with a background recompute running
+        self._refreshing: dict[tuple, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refresh_failures = 0
+        self.compute_time = Histogram()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, db: AsyncSession, request: Request, compute: Compute) -> Any:
+        """Cached response for `request`, calling `compute(db)` when needed"""
+        key = cache_key(request)
+        version = await data_version(db)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            entry_version, computed_at, value = entry
+            age = time.monotonic() - computed_at
+            if entry_version == version and age < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            if age < self.max_stale:
+                self.stale_hits += 1
+                if key not in self._refreshing:
+                    self._refreshing[key] = asyncio.create_task(self._refresh(key, version, compute))
+                return value
+
+        self.misses += 1
+        return await self._compute(db, key, version, compute)
+
+    async def _compute(self, db: AsyncSession, key: tuple, version: tuple, compute: Compute) -> Any:
+        started = time.perf_counter()
+        value = await compute(db)
+        self.compute_time.observe(time.perf_counter() - started)
+
+        self._entries[key] = (version, time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return value
+
+    async def _refresh(self, key: tuple, version: tuple, compute: Compute):
+        # The request's session (and profile) are gone by now: use our own
+        try:
+            with profile(f"analytics refresh {key[0]}"):
+                async with read_session() as db:
+                    await self._compute(db, key, version, compute)
+        except Exception:
+            self.refresh_failures += 1
+            logger.exception("Analytics recompute failed for %s", key[0])
+        finally:
+            del self._refreshing[key]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshing": len(self._refreshing),
+            "refresh_failures": self.refresh_failures,
+            "hit_ratio": (self.hits + self.stale_hits) / lookups if lookups else None,
+            "compute_seconds": self.compute_time.as_dict(),
+        }
+
+
+analytics_cache = AnalyticsCache(
+    max_size=settings.analytics_cache_size,
+    ttl=settings.analytics_cache_ttl,
+    max_stale=settings.analytics_cache_max_stale,
+)
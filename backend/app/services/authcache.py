@@ -0,0 +1,88 @@
+"""
+Cache of authenticated users keyed by bearer token.
+
+get_current_user runs on every API call. A hit skips both the JWT signature
+check and the users query: a token is only cached after it was verified and
+never outlives its `exp` claim. Entries also expire after a TTL (other
+workers may have changed the user) and are dropped explicitly when this
+process updates the user.
+"""
+
+import time
+from collections import OrderedDict
+from uuid import UUID
+
+from app.config import get_settings
+from app.models.user import User
+
+settings = get_settings()
+
+# Columns copied into the snapshot; the password hash is not kept around
+SNAPSHOT_COLUMNS = [
+    column.key for column in User.__table__.c
+    if column.key not in ("hashed_password", "search_vector")
+]
+
+
+class AuthCache:
+    """Bounded TTL/LRU cache of user snapshots keyed by token"""
+
+    def __init__(self, ttl: float = 60, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        # Key: token, Value: (expires_at, user snapshot)
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> User | None:
+        """A fresh, session-less User built from the snapshot, or None"""
+        entry = self._entries.get(token)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[token]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return User(**entry[1])
+
+    def put(self, token: str, user: User, exp: float):
+        """Cache a verified token; `exp` is its expiry as a UNIX timestamp"""
+        ttl = min(self.ttl, exp - time.time())
+        if ttl <= 0:
+            return
+        snapshot = {key: getattr(user, key) for key in SNAPSHOT_COLUMNS}
+        self._entries[token] = (time.monotonic() + ttl, snapshot)
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, user_id: UUID | None = None):
+        """Drop every token of one user, or everything when no id is given"""
+        if user_id is None:
+            self._entries.clear()
+            return
+        stale = [token for token, (_, snapshot) in self._entries.items() if snapshot["id"] == user_id]
+        for token in stale:
+            del self._entries[token]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else None,
+        }
+
+
+auth_cache = AuthCache(ttl=settings.auth_cache_ttl, max_size=settings.auth_cache_size)
@@ -0,0 +1,108 @@
+"""
+task_daily_stats maintenance and queries.
+
+Every status_history insert adds 1 to the (day, to_status, dimensions)
+counter, undo subtracts it again, in the same statement or transaction as
+the history write. Dimensions are recorded on the history row (the task's
+values right after the move), so counting, undo and rebuild() all use the
+same key. Deleting a task drops its history and subtracts it here too, so
+the rollup always equals a rebuild. Analytics reads per-day counts from
+here instead of grouping the live tasks table, and keeps counting moves
+that were later superseded.
+"""
+
+from datetime import date
+
+from sqlalchemy import select, func, literal, literal_column, Integer
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import TaskStatus
+from app.models.status_history import StatusHistory
+from app.models.task_daily_stats import TaskDailyStats, DIMENSIONS, KEY
+
+
+def day_of(timestamp):
+    """Rollup day of a timestamptz: its UTC date, whatever the session time zone"""
+    return func.date(func.timezone(literal_column("'UTC'"), timestamp))
+
+
+def upsert(rows):
+    """
+    INSERT (day, status, *DIMENSIONS, entered) rows selected by `rows`,
+    adding `entered` to existing counters. Keys must be unique within `rows`.
+    """
+    stmt = insert(TaskDailyStats).from_select(["day", "status", *DIMENSIONS, "entered"], rows)
+    return stmt.on_conflict_do_update(
+        index_elements=KEY,
+        set_={"entered": TaskDailyStats.entered + stmt.excluded.entered},
+    )
+
+
+def count_move(history, delta: int = 1):
+    """
+    Upsert for one history row inserted or deleted by the `history` CTE of
+    the same statement (returning created_at, to_status and DIMENSIONS)
+    """
+    return upsert(
+        select(
+            day_of(history.c.created_at),
+            history.c.to_status,
+            *(history.c[name] for name in DIMENSIONS),
+            literal(delta, Integer),
+        )
+    )
+
+
+def history_rollup(*where, sign: int = 1):
+    """Counters aggregated from status_history rows matching `where`"""
+    day = day_of(StatusHistory.created_at)
+    dimensions = [getattr(StatusHistory, name) for name in DIMENSIONS]
+    return (
+        select(day, StatusHistory.to_status, *dimensions, func.count() * sign)
+        .where(*where)
+        .group_by(day, StatusHistory.to_status, *dimensions)
+    )
+
+
+def uncount_tasks(task_ids):
+    """Upsert subtracting all history of `task_ids` (e.g. a DELETE ... RETURNING CTE)"""
+    return upsert(history_rollup(StatusHistory.task_id.in_(task_ids), sign=-1))
+
+
+async def count_history(db: AsyncSession, history_ids: list):
+    """Add already inserted status_history rows to the rollup"""
+    if history_ids:
+        await db.execute(upsert(history_rollup(StatusHistory.id.in_(history_ids))))
+
+
+async def rebuild(db: AsyncSession) -> int:
+    """Recompute the whole table from status_history, returns the number of counters"""
+    await db.execute(TaskDailyStats.__table__.delete())
+    result = await db.execute(
+        insert(TaskDailyStats).from_select(["day", "status", *DIMENSIONS, "entered"], history_rollup())
+    )
+    return result.rowcount
+
+
+async def entered_per_day(
+    db: AsyncSession,
+    status: TaskStatus,
+    start: date,
+    end: date,
+    filters: list = (),
+) -> dict[date, int]:
+    """Moves into `status` per day in [start, end]; filters on TaskDailyStats columns"""
+    result = await db.execute(
+        select(TaskDailyStats.day, func.sum(TaskDailyStats.entered).label("count"))
+        .where(
+            TaskDailyStats.status == status,
+            TaskDailyStats.day >= start,
+            TaskDailyStats.day <= end,
+            *filters,
+        )
+        .group_by(TaskDailyStats.day)
+        .having(func.sum(TaskDailyStats.entered) > 0)
+        .order_by(TaskDailyStats.day)
+    )
+    return {row.day: row.count for row in result}
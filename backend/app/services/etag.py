@@ -0,0 +1,106 @@
+"""
+Conditional GET support.
+
+ETags are derived from cheap aggregate queries (task versions, updated_at
+timestamps, row counts) rather than from the response body, so a request
+with a matching If-None-Match gets a 304 before any rows are loaded or
+serialized.
+"""
+
+import hashlib
+
+from fastapi import Request, Response
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.models.client import Client
+from app.models.media import Media
+from app.models.task import Task
+from app.models.task_tombstone import TaskTombstone
+
+# Responses are per-user and must be revalidated on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def is_fresh(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison (RFC 9110 13.1.2)
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def conditional(request: Request, response: Response, etag: str) -> Response | None:
+    """
+    Return a 304 response when the client already has `etag`, otherwise
+    set the validator headers on `response` and return None. Headers
+    already set on `response` (e.g. Vary) are carried over to the 304, as
+    it must send what the 200 would have (RFC 9110 15.4.5).
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if is_fresh(request, etag):
+        return Response(status_code=304, headers={**response.headers, **headers})
+    response.headers.update(headers)
+    return None
+
+
+def table_state(model) -> list:
+    """
+    Change counter for a table with updated_at: inserts and updates move
+    the max timestamp, deletes change the count.
+    """
+    return [
+        select(func.count()).select_from(model).scalar_subquery(),
+        select(func.max(model.updated_at)).scalar_subquery(),
+    ]
+
+
+def reference_state() -> list:
+    """Users, clients and media are embedded in task payloads"""
+    return [*table_state(User), *table_state(Client), *table_state(Media)]
+
+
+def tasks_state() -> list:
+    """
+    Every task write takes a new value from task_version_seq, deletes via
+    the tombstone, so the two maxima change on any write.
+    """
+    return [
+        select(func.max(Task.version)).scalar_subquery(),
+        select(func.max(TaskTombstone.version)).scalar_subquery(),
+        *reference_state(),
+    ]
+
+
+async def list_etag(db: AsyncSession, request: Request, state: list, *variant) -> str:
+    """
+    ETag for a list endpoint: table state plus the query string and any
+    `variant` selected by headers
+    """
+    result = await db.execute(select(*state))
+    return make_etag(request.url.path, request.url.query, *variant, *result.one())
+
+
+async def row_etag(db: AsyncSession, model, id_) -> str | None:
+    """ETag for a single row, None when it does not exist"""
+    result = await db.execute(select(model.updated_at).where(model.id == id_))
+    row = result.one_or_none()
+    if row is None:
+        return None
+    return make_etag(model.__tablename__, id_, row[0])
+
+
+async def task_etag(db: AsyncSession, task_id) -> str | None:
+    result = await db.execute(select(Task.version, *reference_state()).where(Task.id == task_id))
+    row = result.one_or_none()
+    if row is None:
+        return None
+    return make_etag(Task.__tablename__, task_id, *row)
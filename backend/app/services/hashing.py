@@ -0,0 +1,86 @@
+"""
+Password hashing off the event loop.
+
+bcrypt takes 100-300 ms of CPU per call; run inline it stalls every request
+and websocket on the worker. Calls go to a small thread pool instead (the
+bcrypt C code releases the GIL), which also caps how many run at once.
+Queue and run times are recorded for the stats endpoint.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+from app.config import get_settings
+
+settings = get_settings()
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers,
+    thread_name_prefix="password-hash",
+)
+
+
+class HashingStats:
+    def __init__(self):
+        self.calls = 0
+        self.in_flight = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+        self.run_time_total = 0.0
+        self.run_time_max = 0.0
+
+    def record(self, queued: float, ran: float):
+        self.calls += 1
+        self.queue_time_total += queued
+        self.queue_time_max = max(self.queue_time_max, queued)
+        self.run_time_total += ran
+        self.run_time_max = max(self.run_time_max, ran)
+
+    def as_dict(self) -> dict:
+        return {
+            "workers": settings.password_hash_workers,
+            "calls": self.calls,
+            "in_flight": self.in_flight,
+            "queue_time_avg_ms": self.queue_time_total / self.calls * 1000 if self.calls else None,
+            "queue_time_max_ms": self.queue_time_max * 1000,
+            "run_time_avg_ms": self.run_time_total / self.calls * 1000 if self.calls else None,
+            "run_time_max_ms": self.run_time_max * 1000,
+        }
+
+
+stats = HashingStats()
+
+
+async def _run(func, *args):
+    submitted = time.perf_counter()
+    started = None
+
+    def call():
+        nonlocal started
+        started = time.perf_counter()
+        return func(*args)
+
+    stats.in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, call)
+    finally:
+        stats.in_flight -= 1
+        if started is not None:
+            stats.record(started - submitted, time.perf_counter() - started)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await _run(pwd_context.verify, plain_password, hashed_password)
+
+
+async def hash_password(password: str) -> str:
+    return await _run(pwd_context.hash, password)
+
+
+def shutdown():
+    _executor.shutdown(wait=False, cancel_futures=True)
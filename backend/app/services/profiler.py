@@ -0,0 +1,105 @@
+"""
+Opt-in SQL profiler (settings.sql_profiler).
+
+Counts the statements run inside a `profile()` block (an HTTP request via
+ProfilerMiddleware, or a scheduler job), their total database time and how
+often each statement shape repeats. A shape repeating more than
+sql_profiler_repeat_threshold times is logged as a likely N+1 query.
+"""
+
+import logging
+import re
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Collapse bind placeholder lists so "IN ($1, $2)" and "IN ($1)" share a shape
+_PLACEHOLDERS = re.compile(r"(?:\$\d+|%\(\w+\)s|\?)(?:\s*,\s*(?:\$\d+|%\(\w+\)s|\?))*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    return _PLACEHOLDERS.sub("?", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryProfile:
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.count = 0
+        self.db_time = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.db_time += elapsed
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.db_time * 1000:.1f};desc="{self.count} queries"'
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "duration_ms": round(self.duration * 1000, 1),
+            "queries": self.count,
+            "db_time_ms": round(self.db_time * 1000, 1),
+            "repeated": [
+                {"statement": shape, "count": n}
+                for shape, n in self.repeated(1)
+            ],
+        }
+
+
+current_profile: ContextVar[QueryProfile | None] = ContextVar("current_profile", default=None)
+
+# Most recent finished profiles for the debug endpoint
+recent_profiles: deque[QueryProfile] = deque(maxlen=200)
+
+
+@contextmanager
+def profile(name: str):
+    """Profile the statements run inside the block; yields None when disabled"""
+    if not settings.sql_profiler:
+        yield None
+        return
+
+    query_profile = QueryProfile(name)
+    token = current_profile.set(query_profile)
+    try:
+        yield query_profile
+    finally:
+        current_profile.reset(token)
+        query_profile.duration = time.perf_counter() - query_profile.started
+        recent_profiles.append(query_profile)
+        for shape, n in query_profile.repeated(settings.sql_profiler_repeat_threshold):
+            logger.warning("%s: statement ran %d times (N+1?): %s", name, n, shape[:300])
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, which is discarded if the statement fails
+    context._profiler_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    query_profile = current_profile.get()
+    if query_profile is not None:
+        query_profile.record(statement, time.perf_counter() - context._profiler_started)
+
+
+def install(engine):
+    """Attach the profiler to an (async) engine"""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
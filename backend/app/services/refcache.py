@@ -0,0 +1,125 @@
+"""
+In-process cache of serialized users, clients and media.
+
+Task payloads embed the related user/client/media objects. These change
+rarely compared to tasks, so instead of joining or selectinloading them on
+every task read/write they are resolved from here. Entries expire after a
+TTL (other workers may have changed them) and are dropped explicitly when
+this process updates or deletes the row.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Iterable, Mapping
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.models.client import Client
+from app.models.media import Media
+from app.schemas.user import UserOut
+from app.schemas.client import ClientOut
+from app.schemas.media import MediaOut
+
+
+class ReferenceCache:
+    """Bounded TTL cache of `schema` dicts keyed by primary key"""
+
+    def __init__(self, model, schema: type[BaseModel], ttl: float = 60, max_size: int = 5000):
+        self.model = model
+        self.schema = schema
+        self.ttl = ttl
+        self.max_size = max_size
+        # Key: id, Value: (expires_at, serialized row)
+        self._entries: OrderedDict[UUID, tuple[float, dict]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_many(self, db: AsyncSession, ids: Iterable[UUID | None]) -> dict[UUID, dict]:
+        """Resolve ids, loading all misses with a single query"""
+        now = time.monotonic()
+        found: dict[UUID, dict] = {}
+        missing = set()
+
+        for id_ in ids:
+            if id_ is None or id_ in found:
+                continue
+            entry = self._entries.get(id_)
+            if entry and entry[0] > now:
+                found[id_] = entry[1]
+            else:
+                missing.add(id_)
+
+        if missing:
+            result = await db.execute(select(self.model).where(self.model.id.in_(missing)))
+            for obj in result.scalars():
+                found[obj.id] = self.put(obj)
+
+        return found
+
+    def put(self, obj) -> dict:
+        data = self.schema.model_validate(obj).model_dump()
+        self._entries[obj.id] = (time.monotonic() + self.ttl, data)
+        self._entries.move_to_end(obj.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return data
+
+    def invalidate(self, id_: UUID | None = None):
+        """Drop one entry, or everything when no id is given"""
+        if id_ is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(id_, None)
+
+
+users = ReferenceCache(User, UserOut)
+clients = ReferenceCache(Client, ClientOut)
+media = ReferenceCache(Media, MediaOut)
+
+
+async def _related(db: AsyncSession, rows: list[Mapping]) -> tuple[dict, dict, dict]:
+    """Users, clients and media referenced by task rows"""
+    user_ids = set()
+    for row in rows:
+        user_ids.update((row["author_id"], row["editor_id"], row["manager_id"]))
+
+    found_users = await users.get_many(db, user_ids)
+    found_clients = await clients.get_many(db, (row["client_id"] for row in rows))
+    found_media = await media.get_many(db, (row["media_id"] for row in rows))
+    return found_users, found_clients, found_media
+
+
+async def build_task_out(db: AsyncSession, rows: list[Mapping]) -> list[dict]:
+    """
+    Assemble TaskOut-shaped dicts from plain task rows (e.g. RETURNING or
+    Core results), attaching related objects from the caches. A warm cache
+    costs no queries; a cold one at most one per related table.
+    """
+    found_users, found_clients, found_media = await _related(db, rows)
+
+    tasks = []
+    for row in rows:
+        task = dict(row)
+        task["client"] = found_clients.get(row["client_id"])
+        task["media"] = found_media.get(row["media_id"])
+        task["author"] = found_users.get(row["author_id"])
+        task["editor"] = found_users.get(row["editor_id"])
+        task["manager"] = found_users.get(row["manager_id"])
+        tasks.append(task)
+    return tasks
+
+
+async def build_task_normalized(db: AsyncSession, rows: list[Mapping]) -> dict:
+    """TaskListNormalized-shaped dict: plain task rows plus id-keyed related objects"""
+    found_users, found_clients, found_media = await _related(db, rows)
+    return {
+        "tasks": [dict(row) for row in rows],
+        "users": found_users,
+        "clients": found_clients,
+        "media": found_media,
+    }
@@ -0,0 +1,55 @@
+import re
+from typing import Optional
+
+from sqlalchemy import func, literal_column, case
+
+from app.models.task import Task
+
+# Text search configurations for task languages (tasks.language is RU/EN)
+RUSSIAN = literal_column("'russian'::regconfig")
+ENGLISH = literal_column("'english'::regconfig")
+# Names, emails, handles: no stemming
+SIMPLE = literal_column("'simple'::regconfig")
+
+# Start/stop markers for highlighted fragments
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=25, MinWords=8, MaxFragments=2"
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def prefix_query(text: str) -> Optional[str]:
+    """
+    Turn free user input into a to_tsquery() string matching word prefixes,
+    e.g. "Иван пет" -> "Иван:* & пет:*". Only word characters survive, so the
+    result is always a valid tsquery. Returns None for input without words.
+    """
+    words = _WORD.findall(text)
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def tsquery(query: str, config=RUSSIAN):
+    return func.to_tsquery(config, query)
+
+
+def task_tsquery(query: str):
+    """Match against both configurations: the query language is unknown"""
+    return tsquery(query, RUSSIAN).op("||")(tsquery(query, ENGLISH))
+
+
+def media_tsquery(query: str):
+    """Names/categories are indexed with 'simple', descriptions with 'russian'"""
+    return tsquery(query, SIMPLE).op("||")(tsquery(query, RUSSIAN))
+
+
+def matches(vector, ts_query):
+    return vector.op("@@")(ts_query)
+
+
+def task_config(language=Task.language):
+    """Per-row configuration, mirrors the tasks_search_vector_update() trigger"""
+    return case(
+        (func.upper(language) == "EN", ENGLISH),
+        else_=RUSSIAN,
+    )
@@ -25,6 +25,11 @@ async def get_undo_state(task_id: str) -> dict | None:
     return None
 
 
+def pending_count() -> int:
+    """Undo states currently held (including expired, not yet cleaned up)"""
+    return len(_undo_states)
+
+
 async def _cleanup_after(task_id: str, seconds: int):
     """Remove undo state after expiration"""
     await asyncio.sleep(seconds)
@@ -0,0 +1,36 @@
+"""
+Safe upper bound for task change versions.
+
+Writers take versions from task_version_seq inside their transaction (see
+the task_version_assign() trigger) and may commit out of order. Before its
+first nextval a writing transaction takes a shared advisory lock keyed by
+the sequence's last value and holds it until commit, so all of its
+versions are above that key.
+
+The horizon is the sequence's current last value, lowered to the smallest
+key still held. Every version at or below it belongs to a transaction that
+has already finished, so a snapshot taken *after* reading the horizon (the
+next statement) contains all of them and a delta reader never skips one.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Task list responses carry their horizon here: the `since` for the first
+# /api/tasks/changes call
+VERSION_HEADER = "X-Task-Version"
+
+HORIZON_SQL = text("""
+    SELECT least(
+        (SELECT last_value FROM task_version_seq),
+        (SELECT min((classid::bigint << 32) | objid::bigint)
+           FROM pg_locks
+          WHERE locktype = 'advisory' AND objsubid = 1 AND mode = 'ShareLock')
+    )
+""")
+
+
+async def version_horizon(db: AsyncSession) -> int:
+    """Highest version below which every write has committed (or rolled back)"""
+    result = await db.execute(HORIZON_SQL)
+    return result.scalar_one()
@@ -1,6 +1,10 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from typing import List
+import asyncio
 import json
+import time
+
+from app.services.metrics import Histogram
 
 router = APIRouter()
 
@@ -10,6 +14,8 @@ class ConnectionManager:
     
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        self.broadcast_duration = Histogram()
+        self.broadcast_failures = 0
     
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
@@ -21,16 +27,22 @@ class ConnectionManager:
     
     async def broadcast(self, message: dict):
         """Send message to all connected clients"""
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                disconnected.append(connection)
+        started = time.perf_counter()
+        # Serialize once and share the frame between all sockets
+        data = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+        connections = list(self.active_connections)
+        results = await asyncio.gather(
+            *(connection.send_text(data) for connection in connections),
+            return_exceptions=True,
+        )
         
         # Clean up disconnected clients
-        for conn in disconnected:
-            self.disconnect(conn)
+        for conn, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.broadcast_failures += 1
+                self.disconnect(conn)
+        
+        self.broadcast_duration.observe(time.perf_counter() - started)
     
     async def send_personal(self, websocket: WebSocket, message: dict):
         """Send message to specific client"""
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Rebuild the task_daily_stats rollup from status_history.
+
+The rollup is maintained incrementally by the API; run this after bulk
+imports, manual history edits or if the counters are suspected to have
+drifted. Runs in one transaction, so readers see either the old or the new
+counters. Dimensions (author, editor, ...) come from the history rows,
+which record them at the time of each move, so the result matches the
+incrementally maintained counters. Moves of deleted tasks are in neither.
+
+Usage:
+    python backfill_daily_stats.py
+"""
+
+import asyncio
+import sys
+
+from app.database import engine, async_session
+from app.services import daily_stats
+
+
+async def main() -> int:
+    async with async_session() as db:
+        counters = await daily_stats.rebuild(db)
+        await db.commit()
+    print(f"task_daily_stats rebuilt: {counters} counters")
+
+    await engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
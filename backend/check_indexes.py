@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Check that the hot queries are served by their indexes.
+
+Runs EXPLAIN on each hot query against the configured database and fails
+when the plan does not use the expected index. Sequential scans are disabled
+for the session so the check also works on small (dev/staging) tables,
+where the planner would otherwise prefer a seq scan.
+
+Usage:
+    python check_indexes.py
+"""
+
+import asyncio
+import json
+import sys
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import select, func, text, tuple_
+from sqlalchemy.dialects import postgresql
+
+from app.database import engine
+from app.models.task import Task, TaskStatus
+from app.models.message import Message
+from app.models.file import File
+from app.models.status_history import StatusHistory
+from app.models.task_daily_stats import TaskDailyStats
+from app.services.search import task_tsquery
+
+WIP_STATUSES = [
+    TaskStatus.NEW,
+    TaskStatus.IN_PROGRESS,
+    TaskStatus.EDITOR_REVIEW,
+    TaskStatus.CLIENT_APPROVAL,
+]
+
+
+def hot_queries():
+    """(description, statement, expected index) for every hot query path"""
+    now = datetime.utcnow()
+    some_id = uuid4()
+
+    yield (
+        "board column page",
+        select(Task.id)
+        .where(
+            Task.status == TaskStatus.NEW,
+            tuple_(Task.status_changed_at, Task.id) > (now - timedelta(days=30), some_id),
+        )
+        .order_by(Task.status_changed_at, Task.id)
+        .limit(30),
+        "ix_tasks_status_status_changed_at",
+    )
+    yield (
+        "overdue scan",
+        select(Task.id).where(
+            Task.status.in_(WIP_STATUSES),
+            Task.status_changed_at < now - timedelta(days=3),
+        ),
+        "ix_tasks_active_status_changed_at",
+    )
+    yield (
+        "published in period",
+        select(func.count(Task.id)).where(
+            Task.status == TaskStatus.PUBLISHED,
+            Task.status_changed_at >= now - timedelta(days=30),
+            Task.status_changed_at <= now,
+        ),
+        "ix_tasks_status_status_changed_at",
+    )
+    yield (
+        "postponed resume reminders",
+        select(Task.id).where(
+            Task.status == TaskStatus.POSTPONED,
+            Task.postpone_resume_date <= now.date() + timedelta(days=3),
+        ),
+        "ix_tasks_postponed_resume_date",
+    )
+    for column in ("client_id", "media_id", "author_id", "editor_id", "manager_id"):
+        yield (
+            f"tasks by {column}",
+            select(Task.id).where(getattr(Task, column) == some_id),
+            f"ix_tasks_{column}",
+        )
+    yield (
+        "task changes since version",
+        select(Task.id).where(Task.version > 0).order_by(Task.version).limit(500),
+        "ix_tasks_version",
+    )
+    yield (
+        "full-text task search",
+        select(Task.id).where(Task.search_vector.op("@@")(task_tsquery("пример:*"))),
+        "ix_tasks_search_vector",
+    )
+    yield (
+        "task list substring filter",
+        select(Task.id).where(Task.title.ilike("%пример%") | Task.description.ilike("%пример%")),
+        "ix_tasks_title_trgm",
+    )
+    yield (
+        "task chat",
+        select(Message.id).where(Message.task_id == some_id).order_by(Message.created_at),
+        "ix_messages_task_id_created_at",
+    )
+    yield (
+        "task files",
+        select(File.id).where(File.task_id == some_id).order_by(File.uploaded_at.desc()),
+        "ix_files_task_id_uploaded_at",
+    )
+    yield (
+        "last status change",
+        select(StatusHistory.id)
+        .where(StatusHistory.task_id == some_id)
+        .order_by(StatusHistory.created_at.desc())
+        .limit(1),
+        "ix_status_history_task_id_created_at",
+    )
+    yield (
+        "cycle time window",
+        select(StatusHistory.task_id).where(
+            StatusHistory.to_status == TaskStatus.PUBLISHED,
+            StatusHistory.created_at >= now - timedelta(days=30),
+            StatusHistory.created_at <= now,
+        ),
+        "ix_status_history_to_status_created_at",
+    )
+    yield (
+        "daily publications",
+        select(TaskDailyStats.day, func.sum(TaskDailyStats.entered))
+        .where(
+            TaskDailyStats.status == TaskStatus.PUBLISHED,
+            TaskDailyStats.day >= (now - timedelta(days=30)).date(),
+            TaskDailyStats.day <= now.date(),
+        )
+        .group_by(TaskDailyStats.day),
+        "ix_task_daily_stats_status_day",
+    )
+
+
+def used_indexes(plan: dict) -> set[str]:
+    """Collect every index name referenced anywhere in a JSON plan tree"""
+    names = set()
+    if "Index Name" in plan:
+        names.add(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        names |= used_indexes(child)
+    return names
+
+
+async def main() -> int:
+    failures = 0
+    async with engine.connect() as conn:
+        await conn.execute(text("SET enable_seqscan = off"))
+
+        for description, statement, expected in hot_queries():
+            sql = str(statement.compile(
+                dialect=postgresql.dialect(),
+                compile_kwargs={"literal_binds": True},
+            ))
+            result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+            raw = result.scalar()
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            indexes = used_indexes(plan)
+
+            if expected in indexes:
+                print(f"OK    {description}: {expected}")
+            else:
+                failures += 1
+                found = ", ".join(sorted(indexes)) or plan["Node Type"]
+                print(f"FAIL  {description}: expected {expected}, got {found}")
+
+    await engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -5,8 +5,13 @@ from contextlib import asynccontextmanager
 import os
 
 from app.config import get_settings
-from app.api import auth, tasks, clients, media, users, messages, files, analytics
+from app.api import auth, tasks, clients, media, users, messages, files, analytics, search, internal, metrics
 from app.ws import board
+from app.services import hashing
+from app.services.versions import VERSION_HEADER
+from app.middleware.profiler import ProfilerMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.compression import CompressionMiddleware
 
 settings = get_settings()
 
@@ -17,6 +22,7 @@ async def lifespan(app: FastAPI):
     os.makedirs(settings.upload_dir, exist_ok=True)
     yield
     # Shutdown
+    hashing.shutdown()
 
 
 app = FastAPI(
@@ -31,8 +37,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[VERSION_HEADER],
 )
 
+if settings.sql_profiler:
+    app.add_middleware(ProfilerMiddleware)
+
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_minimum_size)
+app.add_middleware(MetricsMiddleware)
+
 # Static files for uploads
 app.mount("/uploads", StaticFiles(directory=settings.upload_dir), name="uploads")
 
@@ -45,6 +58,9 @@ app.include_router(users.router, prefix="/api/users", tags=["users"])
 app.include_router(messages.router, prefix="/api/messages", tags=["messages"])
 app.include_router(files.router, prefix="/api/files", tags=["files"])
 app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
+app.include_router(search.router, prefix="/api/search", tags=["search"])
+app.include_router(internal.router, prefix="/api/internal", tags=["internal"])
+app.include_router(metrics.router, prefix="/api/metrics", tags=["internal"])
 
 # WebSocket
 app.include_router(board.router, prefix="/api/ws", tags=["websocket"])
@@ -26,10 +26,42 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+async def serve_metrics(port: int) -> asyncio.AbstractServer:
+    """Tiny HTTP endpoint with the scheduler metrics in Prometheus format"""
+    from app.bot.scheduler import scheduler
+    from app.services.metrics import Exposition, CONTENT_TYPE
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            # Any request gets the metrics
+            await reader.readuntil(b"\r\n\r\n")
+            out = Exposition()
+            scheduler.collect_metrics(out)
+            body = out.text().encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                + f"Content-Type: {CONTENT_TYPE}\r\n".encode()
+                + f"Content-Length: {len(body)}\r\n".encode()
+                + b"Connection: close\r\n\r\n"
+                + body
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", port)
+
+
 async def main():
     """Main entry point for the bot"""
     from app.bot.telegram_bot import get_bot
     from app.bot.scheduler import scheduler
+    from app.config import get_settings
+
+    settings = get_settings()
+    metrics_server = None
 
     # Signal handlers for graceful shutdown
     loop = asyncio.get_event_loop()
@@ -56,6 +88,10 @@ async def main():
         await scheduler.start()
         logger.info("Notification scheduler started")
 
+        if settings.bot_metrics_port:
+            metrics_server = await serve_metrics(settings.bot_metrics_port)
+            logger.info(f"Metrics on http://127.0.0.1:{settings.bot_metrics_port}/metrics")
+
         # Wait for shutdown signal
         await stop_event.wait()
 
@@ -66,6 +102,8 @@ async def main():
     finally:
         # Graceful shutdown
         logger.info("Shutting down...")
+        if metrics_server:
+            metrics_server.close()
         await scheduler.stop()
         await bot.stop()
         logger.info("Bot stopped")
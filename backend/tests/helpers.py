@@ -0,0 +1,83 @@
+"""Data setup and API access for the database-backed tests"""
+
+import os
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import httpx
+import pytest
+from sqlalchemy import event, text
+
+from app.api.auth import get_current_user
+from app.database import async_session, engine
+from app.models.client import Client
+from app.models.task import Task
+from app.models.user import User
+from main import app
+
+requires_db = pytest.mark.skipif(not os.environ.get("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL is not set")
+
+
+async def create_user(first_name: str = "Test") -> User:
+    async with async_session() as db:
+        user = User(email=f"{uuid4().hex}@example.com", hashed_password="-", first_name=first_name, last_name="User")
+        db.add(user)
+        await db.commit()
+        return user
+
+
+async def create_task(author: User | None = None, **fields) -> Task:
+    async with async_session() as db:
+        client = Client(first_name="Client", last_name="Test")
+        db.add(client)
+        await db.flush()
+        task = Task(client_id=client.id, author_id=author.id if author else None, title="Client Test", **fields)
+        db.add(task)
+        await db.commit()
+        return task
+
+
+async def reset():
+    """Empty every table the tests write to and drop pooled connections"""
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE users, clients, task_tombstones, task_daily_stats CASCADE"))
+    await engine.dispose()
+
+
+@asynccontextmanager
+async def api_client(user: User):
+    """HTTP client for the app, authenticated as `user`"""
+    app.dependency_overrides[get_current_user] = lambda: user
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
+
+
+class StatementCounter:
+    """Counts round trips on the app's engine: statements plus commits"""
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    def _statement(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def _commit(self, conn):
+        self.commits += 1
+
+    @property
+    def round_trips(self) -> int:
+        return len(self.statements) + self.commits
+
+    def __enter__(self):
+        event.listen(engine.sync_engine, "before_cursor_execute", self._statement)
+        event.listen(engine.sync_engine, "commit", self._commit)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(engine.sync_engine, "before_cursor_execute", self._statement)
+        event.remove(engine.sync_engine, "commit", self._commit)
@@ -0,0 +1,78 @@
+"""Analytics endpoints against a real PostgreSQL database"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.database import async_session
+from app.models.status_history import StatusHistory
+from app.models.task import TaskStatus
+from helpers import api_client, create_task, create_user, requires_db, reset
+
+pytestmark = requires_db
+
+
+async def _seed(now: datetime):
+    """One task: 2h in NEW, 40h in progress, 6h in editor review, then sent to the client"""
+    user = await create_user()
+    task = await create_task(user, status=TaskStatus.CLIENT_APPROVAL, created_at=now - timedelta(hours=50))
+    async with async_session() as db:
+        for from_status, to_status, hours_ago in (
+            (TaskStatus.NEW, TaskStatus.IN_PROGRESS, 48),
+            (TaskStatus.IN_PROGRESS, TaskStatus.EDITOR_REVIEW, 8),
+            (TaskStatus.EDITOR_REVIEW, TaskStatus.CLIENT_APPROVAL, 2),
+        ):
+            db.add(StatusHistory(
+                task_id=task.id,
+                user_id=user.id,
+                from_status=from_status,
+                to_status=to_status,
+                created_at=now - timedelta(hours=hours_ago),
+            ))
+        await db.commit()
+    return user
+
+
+def test_stage_durations():
+    async def run():
+        user = await _seed(datetime.now(timezone.utc))
+        try:
+            async with api_client(user) as http:
+                return await http.get("/api/analytics/stage-durations", params={"period": "month"})
+        finally:
+            await reset()
+
+    response = asyncio.run(run())
+
+    assert response.status_code == 200
+    stages = response.json()["stages"]
+    assert set(stages) == {"new", "in_progress", "editor_review"}
+
+    # Bucket upper bounds: 1, 4, 8, 24, 48, ... hours
+    for stage, hours, bucket in (("new", 2, 1), ("in_progress", 40, 4), ("editor_review", 6, 2)):
+        assert stages[stage]["count"] == 1
+        assert stages[stage]["mean_hours"] == pytest.approx(hours, abs=0.01)
+        assert stages[stage]["p50_hours"] == pytest.approx(hours, abs=0.01)
+        assert stages[stage]["histogram"][bucket] == 1
+        assert sum(stages[stage]["histogram"]) == 1
+
+
+def test_roles():
+    async def run():
+        author, editor = await create_user("Author"), await create_user("Editor")
+        await create_task(author, editor_id=editor.id, status=TaskStatus.PUBLISHED)
+        await create_task(author, status=TaskStatus.IN_PROGRESS)
+        try:
+            async with api_client(author) as http:
+                return await http.get("/api/analytics/roles"), author, editor
+        finally:
+            await reset()
+
+    response, author, editor = asyncio.run(run())
+
+    assert response.status_code == 200
+    roles = response.json()
+    assert roles["authors"] == [{"user_id": str(author.id), "total": 2, "published": 1}]
+    assert roles["editors"] == [{"user_id": str(editor.id), "total": 1, "published": 1}]
+    assert roles["managers"] == []
@@ -0,0 +1,148 @@
+"""Task write paths against a real PostgreSQL database"""
+
+import asyncio
+
+from sqlalchemy import func, select
+
+from app.database import async_session
+from app.models.status_history import StatusHistory
+from app.models.task import TaskStatus
+from app.models.task_daily_stats import TaskDailyStats
+from app.services import daily_stats
+from helpers import StatementCounter, api_client, create_task, create_user, requires_db, reset
+
+pytestmark = requires_db
+
+
+def test_status_change_round_trips():
+    async def run():
+        user = await create_user()
+        task = await create_task(user)
+        try:
+            async with api_client(user) as http:
+                # The first move fills the reference cache for the task's relations
+                first = await http.patch(f"/api/tasks/{task.id}/status", json={"status": "in_progress"})
+                with StatementCounter() as counter:
+                    second = await http.patch(
+                        f"/api/tasks/{task.id}/status",
+                        json={"status": "editor_review", "expected_status": "in_progress"},
+                    )
+                # Backward move without knowing the current status
+                with StatementCounter() as backward:
+                    third = await http.patch(
+                        f"/api/tasks/{task.id}/status",
+                        json={"status": "in_progress", "comment": "Needs another pass"},
+                    )
+            async with async_session() as db:
+                history = (await db.execute(
+                    select(StatusHistory.from_status, StatusHistory.to_status)
+                    .where(StatusHistory.task_id == task.id)
+                    .order_by(StatusHistory.created_at)
+                )).all()
+            return first, second, third, counter, backward, history
+        finally:
+            await reset()
+
+    first, second, third, counter, backward, history = asyncio.run(run())
+
+    assert first.status_code == second.status_code == third.status_code == 200
+    assert counter.round_trips <= 2, counter.statements
+    assert backward.round_trips <= 2, backward.statements
+    assert third.json()["iteration"] == 1
+    assert history == [
+        (TaskStatus.NEW, TaskStatus.IN_PROGRESS),
+        (TaskStatus.IN_PROGRESS, TaskStatus.EDITOR_REVIEW),
+        (TaskStatus.EDITOR_REVIEW, TaskStatus.IN_PROGRESS),
+    ]
+
+
+async def _race(requests) -> list[int]:
+    """Sorted status codes of `requests` run concurrently"""
+    responses = await asyncio.gather(*requests)
+    return sorted(response.status_code for response in responses)
+
+
+async def _history_count(task_id) -> int:
+    async with async_session() as db:
+        result = await db.execute(select(func.count()).where(StatusHistory.task_id == task_id))
+        return result.scalar_one()
+
+
+def test_concurrent_take_has_one_winner():
+    async def run():
+        user = await create_user()
+        task = await create_task()
+        try:
+            async with api_client(user) as http:
+                codes = await _race(http.post(f"/api/tasks/{task.id}/take") for _ in range(20))
+            return codes, await _history_count(task.id)
+        finally:
+            await reset()
+
+    codes, history = asyncio.run(run())
+
+    assert codes == [200] + [409] * 19
+    assert history == 1
+
+
+def test_concurrent_status_change_has_one_winner():
+    async def run():
+        user = await create_user()
+        task = await create_task(user)
+        try:
+            async with api_client(user) as http:
+                codes = await _race(
+                    http.patch(
+                        f"/api/tasks/{task.id}/status",
+                        json={"status": "in_progress", "expected_status": "new"},
+                    )
+                    for _ in range(10)
+                )
+            return codes, await _history_count(task.id)
+        finally:
+            await reset()
+
+    codes, history = asyncio.run(run())
+
+    assert codes == [200] + [409] * 9
+    assert history == 1
+
+
+async def _daily_stats() -> dict:
+    async with async_session() as db:
+        result = await db.execute(
+            select(TaskDailyStats.day, TaskDailyStats.status, TaskDailyStats.author_id, TaskDailyStats.entered)
+            .where(TaskDailyStats.entered != 0)
+        )
+        return {(row.day, row.status, row.author_id): row.entered for row in result}
+
+
+def test_daily_stats_match_rebuild_after_reassign_undo_and_delete():
+    async def run():
+        first, second = await create_user("First"), await create_user("Second")
+        kept = await create_task(first)
+        deleted = await create_task(first)
+        try:
+            async with api_client(first) as http:
+                for task in (kept, deleted):
+                    await http.patch(f"/api/tasks/{task.id}/status", json={"status": "in_progress"})
+                await http.patch(f"/api/tasks/{kept.id}", json={"author_id": str(second.id)})
+                await http.patch(f"/api/tasks/{kept.id}/status", json={"status": "editor_review"})
+                undo = await http.post(f"/api/tasks/{kept.id}/undo")
+                await http.delete(f"/api/tasks/{deleted.id}")
+            live = await _daily_stats()
+            async with async_session() as db:
+                await daily_stats.rebuild(db)
+                await db.commit()
+            return undo, first, live, await _daily_stats()
+        finally:
+            await reset()
+
+    undo, first, live, rebuilt = asyncio.run(run())
+
+    assert undo.status_code == 200
+    # The move into review was counted under the new author and uncounted
+    # there again; the first move stays with the author at the time
+    assert list(live.values()) == [1]
+    assert [key[1:] for key in live] == [(TaskStatus.IN_PROGRESS, first.id)]
+    assert live == rebuilt
@@ -6,6 +6,12 @@ import { API_BASE } from '$lib/api.js';
 function createTasksStore() {
 	const { subscribe, set, update } = writable([]);
 
+	// Delta sync cursor: the list's X-Task-Version horizon, then the
+	// `version` of each /api/tasks/changes response. Never taken from task
+	// versions, which can run ahead of writes that have not committed yet
+	let version = 0;
+	let lastFilters = {};
+
 	let token = null;
 	auth.subscribe(state => {
 		token = state.token;
@@ -16,20 +22,101 @@ function createTasksStore() {
 		'Authorization': `Bearer ${token}`
 	});
 
+	// Re-attach related objects sent once per id in the normalized list
+	const denormalize = ({ tasks, users, clients, media }) => tasks.map(task => ({
+		...task,
+		client: clients[task.client_id] ?? null,
+		media: media[task.media_id] ?? null,
+		author: users[task.author_id] ?? null,
+		editor: users[task.editor_id] ?? null,
+		manager: users[task.manager_id] ?? null
+	}));
+
+	const load = async (filters = {}) => {
+		const params = new URLSearchParams({ format: 'normalized' });
+		Object.entries(filters).forEach(([key, value]) => {
+			if (value) params.append(key, value);
+		});
+
+		const response = await fetch(`${API_BASE}/api/tasks/?${params}`, {
+			headers: getHeaders()
+		});
+		const tasks = denormalize(await response.json());
+		lastFilters = filters;
+		version = Number(response.headers.get('X-Task-Version')) || 0;
+		set(tasks);
+		return tasks;
+	};
+
 	return {
 		subscribe,
-		load: async (filters = {}) => {
-			const params = new URLSearchParams();
-			Object.entries(filters).forEach(([key, value]) => {
-				if (value) params.append(key, value);
+		load,
+		// Apply a task pushed over the websocket
+		apply: (task) => {
+			if (Object.values(lastFilters).some(Boolean)) {
+				return load(lastFilters);
+			}
+			update(tasks => {
+				const existing = tasks.find(t => t.id === task.id);
+				if (!existing) return [...tasks, task];
+				// Events can arrive out of order: never go back to an older version
+				if (task.version < existing.version) return tasks;
+				return tasks.map(t => t.id === task.id ? task : t);
 			});
-
-			const response = await fetch(`${API_BASE}/api/tasks/?${params}`, {
-				headers: getHeaders()
+		},
+		remove: (taskId) => {
+			update(tasks => tasks.filter(t => t.id !== taskId));
+		},
+		// Apply a coalesced bulk event in a single store update
+		applyBulk: (changedTasks, deletedIds) => {
+			if (Object.values(lastFilters).some(Boolean)) {
+				return load(lastFilters);
+			}
+			const changed = new Map(changedTasks.map(t => [t.id, t]));
+			const deleted = new Set(deletedIds);
+			update(tasks => {
+				const next = tasks
+					.filter(t => !deleted.has(t.id))
+					.map(t => {
+						const fresh = changed.get(t.id);
+						changed.delete(t.id);
+						return fresh && fresh.version >= t.version ? fresh : t;
+					});
+				return [...next, ...changed.values()];
 			});
-			const tasks = await response.json();
-			set(tasks);
-			return tasks;
+		},
+		// Apply only what changed since the last known version
+		sync: async () => {
+			// Deltas are unfiltered; filtered views fall back to a full reload
+			if (Object.values(lastFilters).some(Boolean)) {
+				return load(lastFilters);
+			}
+
+			let hasMore = true;
+			while (hasMore) {
+				const response = await fetch(`${API_BASE}/api/tasks/changes?since=${version}`, {
+					headers: getHeaders()
+				});
+				if (!response.ok) return;
+
+				const changes = await response.json();
+				const changed = new Map(changes.tasks.map(t => [t.id, t]));
+				const deleted = new Set(changes.deleted);
+
+				update(tasks => {
+					const next = tasks
+						.filter(t => !deleted.has(t.id))
+						.map(t => {
+							const fresh = changed.get(t.id);
+							changed.delete(t.id);
+							return fresh || t;
+						});
+					return [...next, ...changed.values()];
+				});
+
+				version = changes.version;
+				hasMore = changes.has_more;
+			}
 		},
 		create: async (taskData) => {
 			const response = await fetch(`${API_BASE}/api/tasks/`, {
@@ -78,6 +165,12 @@ function createTasksStore() {
 				method: 'POST',
 				headers: getHeaders()
 			});
+			
+			if (!response.ok) {
+				const error = await response.json();
+				throw new Error(error.detail || 'Ошибка отмены');
+			}
+			
 			const task = await response.json();
 			update(tasks => tasks.map(t => t.id === taskId ? task : t));
 			return task;
@@ -87,6 +180,12 @@ function createTasksStore() {
 				method: 'POST',
 				headers: getHeaders()
 			});
+			
+			if (!response.ok) {
+				const error = await response.json();
+				throw new Error(error.detail || 'Не удалось взять задачу');
+			}
+			
 			const task = await response.json();
 			update(tasks => tasks.map(t => t.id === taskId ? task : t));
 			return task;
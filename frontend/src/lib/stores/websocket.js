@@ -10,6 +10,7 @@ function createWebSocketStore() {
 
 	let ws = null;
 	let reconnectTimeout = null;
+	let hasConnected = false;
 
 	const connect = () => {
 		if (!browser) return;
@@ -20,6 +21,9 @@ function createWebSocketStore() {
 		ws.onopen = () => {
 			update(state => ({ ...state, connected: true, reconnecting: false }));
 			console.log('WebSocket connected');
+			// Catch up on events missed while disconnected
+			if (hasConnected) tasks.sync();
+			hasConnected = true;
 		};
 
 		ws.onclose = () => {
@@ -49,11 +53,18 @@ function createWebSocketStore() {
 			case 'task_status_changed':
 			case 'task_taken':
 			case 'task_undo':
-				// Reload tasks to get fresh data
-				tasks.load();
+				// Events carry the serialized task
+				if (message.task) {
+					tasks.apply(message.task);
+				} else {
+					tasks.sync();
+				}
 				break;
 			case 'task_deleted':
-				// Task will be removed via broadcast
+				tasks.remove(message.task_id);
+				break;
+			case 'tasks_bulk':
+				tasks.applyBulk(message.tasks, message.deleted);
 				break;
 			case 'new_message':
 				// Handle new chat message